@@ -8,7 +8,7 @@ import os
 from contextlib import suppress
 from pathlib import Path
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import FileResponse, StreamingResponse
 from loguru import logger
 from pydantic import BaseModel
@@ -16,7 +16,7 @@ from pydantic import BaseModel
 from blsync import get_global_configs
 from blsync.consumer.bilibili import BiliVideoTaskContext
 from blsync.database import get_task_dal
-from blsync.model.task import TaskStatus
+from blsync.model.task import BiliVideoTaskDAL, TaskStatus
 from blsync.progress import get_progress_broker
 from blsync.scraper import BScraper
 
@@ -85,7 +85,9 @@ async def spa_fallback(full_path: str) -> FileResponse:
 
 
 @api_router.post("/task/bili", tags=["任务"], summary="创建 Bilibili 下载任务")
-async def create_task(task: TaskRequest):
+async def create_task(
+    task: TaskRequest, task_dal: BiliVideoTaskDAL = Depends(get_task_dal)
+):
     """
     创建 Bilibili 视频下载任务
 
@@ -96,8 +98,6 @@ async def create_task(task: TaskRequest):
     4. 若不存在，创建新任务到数据库
     """
     try:
-        task_dal = get_task_dal()
-
         # 创建任务上下文
         task_context = BiliVideoTaskContext(
             bid=task.bid,
@@ -143,6 +143,13 @@ async def create_task(task: TaskRequest):
             favid=task.favid,
             task_context=task_context_dict,
         )
+        if task_model is None:
+            # 检查之后任务已被其他请求创建
+            return {
+                "status": "exists",
+                "message": f"Task {task.bid} already exists",
+                "task_id": None,
+            }
         return {
             "status": "success",
             "message": f"Task {task.bid} added to database",
@@ -155,13 +162,12 @@ async def create_task(task: TaskRequest):
 
 
 @api_router.get("/tasks/status", tags=["任务"], summary="获取任务队列状态")
-async def get_task_status():
+async def get_task_status(task_dal: BiliVideoTaskDAL = Depends(get_task_dal)):
     """
     获取当前任务队列的状态信息
 
     返回各状态任务的数量统计。
     """
-    task_dal = get_task_dal()
     stats = await task_dal.get_task_stats()
 
     return {
@@ -216,12 +222,18 @@ async def get_tasks(
     page: int = Query(1, ge=1, description="页码"),
     page_size: int = Query(20, ge=1, le=100, description="每页数量"),
     status: str | None = Query(None, description="状态筛选"),
+    after_created_at: str | None = Query(
+        None, description="游标：上一页 next_cursor 中的 created_at"
+    ),
+    after_id: int | None = Query(None, description="游标：上一页 next_cursor 中的 id"),
+    task_dal: BiliVideoTaskDAL = Depends(get_task_dal),
 ):
     """
     分页获取任务列表，支持按状态筛选。
-    """
-    task_dal = get_task_dal()
 
+    传入上一页返回的 next_cursor（after_created_at 与 after_id）时按游标翻页，
+    翻页开销与页码无关，适合浏览大量任务；此时忽略 page 参数且不返回 total。
+    """
     # 验证 status 参数
     valid_statuses = {s.value for s in TaskStatus}
     if status and status not in valid_statuses:
@@ -230,6 +242,21 @@ async def get_tasks(
             detail=f"Invalid status. Valid values are: {', '.join(valid_statuses)}",
         )
 
+    # 验证游标参数
+    if (after_created_at is None) != (after_id is None):
+        raise HTTPException(
+            status_code=400,
+            detail="after_created_at and after_id must be provided together",
+        )
+
+    if after_id is not None:
+        return await task_dal.get_tasks_after(
+            after_created_at=after_created_at,
+            after_id=after_id,
+            page_size=page_size,
+            status=status,
+        )
+
     result = await task_dal.get_tasks_paginated(
         page=page, page_size=page_size, status=status
     )
@@ -269,29 +296,24 @@ async def stream_all_task_events():
 
 
 @api_router.get("/tasks/{task_id}", tags=["任务"], summary="获取任务详情")
-async def get_task_detail(task_id: int):
+async def get_task_detail(
+    task_id: int, task_dal: BiliVideoTaskDAL = Depends(get_task_dal)
+):
     """
     获取单个任务的详细信息。
     """
-    task_dal = get_task_dal()
-
-    async with task_dal.async_session() as session:
-        from blsync.model.task import TaskModel, select
-
-        stmt = select(TaskModel).where(TaskModel.id == task_id)
-        result = await session.execute(stmt)
-        task = result.scalar_one_or_none()
-
-        if task is None:
-            raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
+    task = await task_dal.get_task_by_id(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
 
-        return task_dal._task_to_dict(task)
+    return task_dal._task_to_dict(task)
 
 
 @api_router.get("/tasks/{task_id}/events", tags=["任务"], summary="订阅任务进度")
-async def stream_task_events(task_id: int):
+async def stream_task_events(
+    task_id: int, task_dal: BiliVideoTaskDAL = Depends(get_task_dal)
+):
     """Stream latest and future progress events for one task as SSE."""
-    task_dal = get_task_dal()
     async with task_dal.async_session() as session:
         from blsync.model.task import TaskModel, select
 
@@ -328,7 +350,11 @@ async def stream_task_events(task_id: int):
 
 
 @api_router.put("/tasks/{task_id}/status", tags=["任务"], summary="手动修改任务状态")
-async def update_task_status(task_id: int, request: UpdateTaskStatusRequest):
+async def update_task_status(
+    task_id: int,
+    request: UpdateTaskStatusRequest,
+    task_dal: BiliVideoTaskDAL = Depends(get_task_dal),
+):
     """
     手动修改任务状态。
 
@@ -349,44 +375,27 @@ async def update_task_status(task_id: int, request: UpdateTaskStatusRequest):
             detail=f"Invalid status '{request.status}'. Valid values are: {', '.join(valid_statuses)}",
         )
 
-    task_dal = get_task_dal()
-
     # 通过 task_id 获取任务
-    async with task_dal.async_session() as session:
-        from blsync.model.task import TaskModel, select
+    task = await task_dal.get_task_by_id(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
 
-        stmt = select(TaskModel).where(TaskModel.id == task_id)
-        result = await session.execute(stmt)
-        task = result.scalar_one_or_none()
+    # 验证：如果设置为 failed，必须有错误信息
+    new_status = TaskStatus(request.status)
+    if new_status == TaskStatus.FAILED and not request.error_message:
+        raise HTTPException(
+            status_code=400,
+            detail="error_message is required when status is 'failed'",
+        )
 
-        if task is None:
-            raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
+    # 由 DAL 更新状态、完成时间与错误信息，并发布状态事件
+    task = await task_dal.update_task_status(
+        task.task_key, new_status, request.error_message
+    )
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
 
-        # 验证：如果设置为 failed，必须有错误信息（可选）
-        new_status = TaskStatus(request.status)
-        if new_status == TaskStatus.FAILED and request.error_message:
-            session.add(task)
-            task.status = new_status.value
-            task.error_message = request.error_message
-        elif new_status == TaskStatus.FAILED:
-            raise HTTPException(
-                status_code=400,
-                detail="error_message is required when status is 'failed'",
-            )
-        elif new_status == TaskStatus.COMPLETED:
-            session.add(task)
-            task.status = new_status.value
-            task.completed_at = task.updated_at
-            task.error_message = None
-        else:
-            session.add(task)
-            task.status = new_status.value
-
-        await session.commit()
-        await session.refresh(task)
-        task_dal._publish_status_event(task, new_status, request.error_message)
-
-        return task_dal._task_to_dict(task)
+    return task_dal._task_to_dict(task)
 
 
 def start_server():
@@ -1,4 +1,5 @@
 import asyncio
+import os
 import sys
 from contextlib import asynccontextmanager
 
@@ -194,38 +195,54 @@ async def scan_favorites_once() -> dict[str, int]:
         task_dal = get_task_dal()
         stats = {"created": 0, "reset": 0, "skipped": 0}
 
-        async for bvid, task_name in bs.get_all_bvids():
-            context = BiliVideoTaskContext(bid=bvid, task_name=task_name)
-            status = await task_dal.get_bili_video_task_status(bvid, task_name)
+        async for batch in bs.get_all_bvids_batched():
+            # 每批只查询一次数据库获取已有任务的状态
+            task_keys = [
+                make_bili_video_key(bvid, task_name) for bvid, task_name in batch
+            ]
+            statuses = await task_dal.get_task_statuses(task_keys)
 
-            if status is None:
-                await task_dal.create_bili_video_task(
-                    bvid=bvid,
-                    favid=task_name,
-                    task_context=context.model_dump(),
-                )
-                stats["created"] += 1
-                logger.info(f"[task_producer] Added new task {bvid} for {task_name}")
-            elif status == TaskStatus.FAILED:
-                task_key = make_bili_video_key(bvid, task_name)
-                await task_dal.update_task_status(task_key, TaskStatus.READY)
-                stats["reset"] += 1
-                logger.info(
-                    f"[task_producer] Reset failed task {bvid} for {task_name} to READY"
-                )
-            elif status in (
-                TaskStatus.READY,
-                TaskStatus.CONSUMING,
-                TaskStatus.DOWNLOADING,
-                TaskStatus.COMPLETED,
-            ):
-                stats["skipped"] += 1
-                logger.debug(
-                    f"[task_producer] Task {bvid} (task_name: {task_name}) "
-                    f"is {status.value}, skipping"
-                )
-            else:
-                logger.warning(f"[task_producer] Unknown task status: {status}")
+            for (bvid, task_name), task_key in zip(batch, task_keys):
+                context = BiliVideoTaskContext(bid=bvid, task_name=task_name)
+                status = statuses.get(task_key)
+
+                if status is None:
+                    created = await task_dal.create_bili_video_task(
+                        bvid=bvid,
+                        favid=task_name,
+                        task_context=context.model_dump(),
+                    )
+                    # 同一批中重复出现的视频不再重复创建
+                    statuses[task_key] = TaskStatus.READY
+                    if created is None:
+                        # 任务已被其他请求创建
+                        stats["skipped"] += 1
+                        continue
+                    stats["created"] += 1
+                    logger.info(
+                        f"[task_producer] Added new task {bvid} for {task_name}"
+                    )
+                elif status == TaskStatus.FAILED:
+                    await task_dal.update_task_status(task_key, TaskStatus.READY)
+                    # 同一批中重复出现的失败视频只重置一次
+                    statuses[task_key] = TaskStatus.READY
+                    stats["reset"] += 1
+                    logger.info(
+                        f"[task_producer] Reset failed task {bvid} for {task_name} to READY"
+                    )
+                elif status in (
+                    TaskStatus.READY,
+                    TaskStatus.CONSUMING,
+                    TaskStatus.DOWNLOADING,
+                    TaskStatus.COMPLETED,
+                ):
+                    stats["skipped"] += 1
+                    logger.debug(
+                        f"[task_producer] Task {bvid} (task_name: {task_name}) "
+                        f"is {status.value}, skipping"
+                    )
+                else:
+                    logger.warning(f"[task_producer] Unknown task status: {status}")
 
         return stats
 
@@ -285,7 +302,13 @@ async def start_background_tasks():
 async def lifespan(app: FastAPI):
     """
     启动Web服务前，启动后台任务ß
+
+    设置环境变量 TESTING 时跳过后台任务和数据库连接，供测试快速启动
     """
+    if os.environ.get("TESTING"):
+        yield
+        return
+
     logger.info("Starting background tasks...")
     tasks = asyncio.create_task(start_background_tasks())
     yield
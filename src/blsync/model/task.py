@@ -1,26 +1,60 @@
 """Task database models using SQLAlchemy."""
 
+import asyncio
 import enum
+import hashlib
 import json
 import os
+import re
+import sys
 import zoneinfo
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable, Sequence
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from functools import cached_property, lru_cache, partial
+from operator import attrgetter
 from typing import Any
 
+import orjson
 from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    Connection,
     DateTime,
     Index,
+    Row,
     String,
     Text,
+    UnaryExpression,
+    and_,
+    bindparam,
     delete,
     event,
     func,
+    inspect,
+    lambda_stmt,
     select,
     text,
     update,
 )
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    Session,
+    SessionTransaction,
+    defer,
+    mapped_column,
+)
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+from sqlalchemy.sql.operators import custom_op
 
 from blsync.progress import (
     DownloadProgressEvent,
@@ -61,6 +95,63 @@ def format_datetime(dt: datetime | None) -> str | None:
     return dt_local.isoformat()
 
 
+# Task contexts estimated to be larger than this are serialized off the event loop
+INLINE_SERIALIZE_LIMIT = 16 * 1024
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize a task context to JSON."""
+    return orjson.dumps(obj).decode()
+
+
+def _dumps_key(task_key: dict[str, str]) -> str:
+    """
+    Serialize a task key to its canonical JSON string.
+
+    Stored keys use the json module's default separators, orjson only emits
+    compact JSON and would not match keys already in the database.
+    """
+    return json.dumps(task_key, sort_keys=True)
+
+
+# orjson accepts both str and bytes and parses JSON from any encoder
+_loads = orjson.loads
+
+
+async def _serialize_ctx(ctx: dict[str, Any]) -> str:
+    """
+    Serialize a task context without blocking the event loop on large payloads.
+
+    The size is a cheap shallow estimate, small contexts are serialized inline
+    since handing them to a worker thread would cost more than encoding them.
+    """
+    size = sys.getsizeof(ctx) + sum(sys.getsizeof(v) for v in ctx.values())
+    if size <= INLINE_SERIALIZE_LIMIT:
+        return _dumps(ctx)
+    return await asyncio.to_thread(_dumps, ctx)
+
+
+def task_key_hash(task_key: str) -> int:
+    """
+    Hash a task_key JSON string to a stable signed 64-bit integer.
+
+    Used for compact index probes, it must stay stable across processes so
+    the builtin hash() is not an option.
+    """
+    digest = hashlib.blake2b(task_key.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def _sql_utc_now() -> ColumnElement[datetime]:
+    """
+    Current UTC time evaluated by SQLite, with millisecond precision.
+
+    Used as a SQL expression default so timestamps are stamped inside the
+    INSERT or UPDATE statement instead of by a Python callback per row.
+    """
+    return func.strftime("%Y-%m-%d %H:%M:%f", "now", type_=DateTime())
+
+
 class TaskType(str, enum.Enum):
     """Task type enumeration."""
 
@@ -92,6 +183,9 @@ class TaskModel(Base):
         id: Primary key
         task_type: Task type (e.g., 'bili_video')
         task_key: Unique task identifier in JSON format (e.g., '{"bvid":"BV1xx","favid":"123"}')
+        task_key_hash: 64-bit hash of task_key for cheap index lookups
+        bvid: Video ID of Bilibili video tasks (optional)
+        favid: Favorite list ID of Bilibili video tasks (optional)
         task_data: Serialized task context (JSON)
         status: Task status
         created_at: Task creation timestamp
@@ -105,11 +199,14 @@ class TaskModel(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     task_type: Mapped[str] = mapped_column(String(50))
     task_key: Mapped[str] = mapped_column(String(500))
+    task_key_hash: Mapped[int] = mapped_column(BigInteger())
     task_data: Mapped[str] = mapped_column(Text())
+    bvid: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    favid: Mapped[str | None] = mapped_column(String(200), nullable=True)
     status: Mapped[str] = mapped_column(String(20), default=TaskStatus.READY.value)
-    created_at: Mapped[datetime] = mapped_column(DateTime(), default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(), default=_sql_utc_now())
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(), default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime(), default=_sql_utc_now(), onupdate=_sql_utc_now()
     )
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(), nullable=True)
     error_message: Mapped[str | None] = mapped_column(Text(), nullable=True)
@@ -117,20 +214,96 @@ class TaskModel(Base):
     # Unique index on task_key and regular indexes for common queries
     __table_args__ = (
         Index("ix_tasks_task_key", "task_key", unique=True),
+        Index("ix_tasks_task_key_hash", "task_key_hash"),
         Index("ix_tasks_task_type", "task_type"),
-        Index("ix_tasks_status", "status"),
+        Index("ix_tasks_status_created_at", "status", "created_at"),
         Index("ix_tasks_created_at", "created_at"),
+        Index("ix_tasks_favid_status", "favid", "status"),
     )
+    # Fetch SQL-generated timestamps with RETURNING on flush, so that they are
+    # still readable on instances detached after commit
+    __mapper_args__ = {"eager_defaults": True}
 
-    @property
+    @classmethod
+    def _unindexed_task_key(cls) -> ColumnElement[str]:
+        """
+        task_key written as "+task_key", which SQLite never probes an index
+        for, so that the planner does not prefer the wide unique index over
+        the hash index.
+        """
+        return UnaryExpression(
+            cls.task_key.expression, operator=custom_op("+"), type_=cls.task_key.type
+        )
+
+    @classmethod
+    def key_clause(cls, task_key: str) -> ColumnElement[bool]:
+        """
+        Build the WHERE clause matching a task_key.
+
+        The hash narrows the index probe to an integer comparison, the key
+        itself is still compared to stay correct on hash collisions.
+        """
+        return and_(
+            cls.task_key_hash == task_key_hash(task_key),
+            cls._unindexed_task_key() == task_key,
+        )
+
+    @classmethod
+    def bound_key_clause(cls) -> ColumnElement[bool]:
+        """
+        Build the WHERE clause of key_clause with named bound parameters.
+
+        The clause does not depend on the key, so statements using it can be
+        cached and reused; values are passed with key_params.
+        """
+        return and_(
+            cls.task_key_hash == bindparam("key_hash", type_=BigInteger()),
+            cls._unindexed_task_key() == bindparam("key", type_=String()),
+        )
+
+    @staticmethod
+    def key_params(task_key: str) -> dict[str, Any]:
+        """Build the bound parameters for bound_key_clause."""
+        return {"key": task_key, "key_hash": task_key_hash(task_key)}
+
+    @classmethod
+    def keys_clause(cls) -> ColumnElement[bool]:
+        """Build the WHERE clause matching any of several task_keys."""
+        return and_(
+            cls.task_key_hash.in_(
+                bindparam("task_key_hashes", expanding=True, type_=BigInteger())
+            ),
+            cls._unindexed_task_key().in_(
+                bindparam("task_keys", expanding=True, type_=String())
+            ),
+        )
+
+    @staticmethod
+    def keys_params(task_keys: Sequence[str]) -> dict[str, list]:
+        """Build the bound parameters for keys_clause."""
+        return {
+            "task_keys": list(task_keys),
+            "task_key_hashes": [task_key_hash(task_key) for task_key in task_keys],
+        }
+
+    @cached_property
     def key_dict(self) -> dict[str, str]:
-        """Parse task_key JSON to dictionary."""
-        return json.loads(self.task_key)
+        """Parse task_key JSON to dictionary, parsed once per instance."""
+        return _loads(self.task_key)
 
     @property
     def task_context_dict(self) -> dict[str, Any]:
-        """Deserialize task_data JSON to dictionary."""
-        return json.loads(self.task_data)
+        """
+        Deserialize task_data JSON to dictionary.
+
+        The result is kept until task_data is replaced on this instance.
+        """
+        task_data = self.task_data
+        cached = self.__dict__.get("_task_context_cache")
+        if cached is None or cached[0] is not task_data:
+            cached = (task_data, _loads(task_data))
+            self.__dict__["_task_context_cache"] = cached
+        return cached[1]
 
     @classmethod
     def from_task_context(
@@ -147,13 +320,47 @@ class TaskModel(Base):
             task_key: Unique identifier dict (e.g., {"bvid": "BV1xx", "favid": "123"})
             task_context: Task context dictionary
         """
+        if task_type == TaskType.BILI_VIDEO and task_key.keys() == {"bvid", "favid"}:
+            # Fill the bvid/favid columns that lookups and cleanup filter on
+            return cls(
+                **cls.bili_video_task_values(
+                    task_key["bvid"], task_key["favid"], task_context
+                )
+            )
+        task_key_str = _dumps_key(task_key)
         return cls(
             task_type=task_type.value,
-            task_key=json.dumps(task_key, sort_keys=True),
-            task_data=json.dumps(task_context),
+            task_key=task_key_str,
+            task_key_hash=task_key_hash(task_key_str),
+            task_data=_dumps(task_context),
             status=TaskStatus.READY.value,
         )
 
+    @staticmethod
+    def bili_video_task_values(
+        bvid: str,
+        favid: str,
+        task_context: dict[str, Any],
+    ) -> dict[str, Any]:
+        """
+        Build the column values of a new Bilibili video task.
+
+        Args:
+            bvid: Video ID
+            favid: Favorite list ID
+            task_context: Task context dictionary
+        """
+        task_key = make_bili_video_key(bvid, favid)
+        return {
+            "task_type": TaskType.BILI_VIDEO.value,
+            "task_key": task_key,
+            "task_key_hash": task_key_hash(task_key),
+            "task_data": _dumps(task_context),
+            "bvid": bvid,
+            "favid": favid,
+            "status": TaskStatus.READY.value,
+        }
+
     @classmethod
     def create_bili_video_task(
         cls,
@@ -169,13 +376,20 @@ class TaskModel(Base):
             favid: Favorite list ID
             task_context: Task context dictionary
         """
-        return cls.from_task_context(
-            task_type=TaskType.BILI_VIDEO,
-            task_key={"bvid": bvid, "favid": favid},
-            task_context=task_context,
-        )
+        return cls(**cls.bili_video_task_values(bvid, favid, task_context))
+
+
+# Printable ASCII other than quotes and backslashes, which JSON encodes as is
+_PLAIN_KEY_VALUE = r"[ !#-\[\]-~]*"
+_PLAIN_KEY_VALUE_RE = re.compile(_PLAIN_KEY_VALUE)
+_BILI_VIDEO_KEY_RE = re.compile(
+    rf'\{{"bvid": "({_PLAIN_KEY_VALUE})", "favid": "({_PLAIN_KEY_VALUE})"\}}'
+)
 
 
+# Each scan builds and parses the keys of every favorite list entry again,
+# so remember the most recent ones
+@lru_cache(maxsize=4096)
 def make_bili_video_key(bvid: str, favid: str) -> str:
     """
     Create a task_key JSON string for Bilibili video tasks.
@@ -187,9 +401,15 @@ def make_bili_video_key(bvid: str, favid: str) -> str:
     Returns:
         JSON string representing the task key
     """
-    return json.dumps({"bvid": bvid, "favid": favid}, sort_keys=True)
+    # Plain values are formatted directly, the result is identical to
+    # _dumps_key; anything needing escapes (e.g. non-ASCII task names) is
+    # left to the JSON encoder
+    if _PLAIN_KEY_VALUE_RE.fullmatch(bvid) and _PLAIN_KEY_VALUE_RE.fullmatch(favid):
+        return f'{{"bvid": "{bvid}", "favid": "{favid}"}}'
+    return _dumps_key({"bvid": bvid, "favid": favid})
 
 
+@lru_cache(maxsize=4096)
 def parse_bili_video_key(task_key: str) -> tuple[str, str]:
     """
     Parse a Bilibili video task_key JSON string.
@@ -200,10 +420,101 @@ def parse_bili_video_key(task_key: str) -> tuple[str, str]:
     Returns:
         Tuple of (bvid, favid)
     """
-    key_dict = json.loads(task_key)
+    match = _BILI_VIDEO_KEY_RE.fullmatch(task_key)
+    if match is not None:
+        return match[1], match[2]
+    key_dict = _loads(task_key)
     return key_dict["bvid"], key_dict["favid"]
 
 
+# Columns returned by the task list queries, in the order of their raw rows
+_TASK_COLUMNS = (
+    "id",
+    "task_type",
+    "task_key",
+    "task_data",
+    "status",
+    "created_at",
+    "updated_at",
+    "completed_at",
+    "error_message",
+)
+_TASK_ATTRS = attrgetter(*_TASK_COLUMNS)
+
+
+def _format_stored_datetime(value: datetime | str | None) -> str | None:
+    """Format a datetime column value which raw SQL returns as string."""
+    if isinstance(value, str):
+        # Parse string dates from SQLite before converting to target timezone
+        value = datetime.fromisoformat(value)
+    return format_datetime(value)
+
+
+def _upgrade_tasks_table(conn: Connection) -> None:
+    """
+    Add columns introduced after a tasks table was created and backfill them.
+
+    create_all() only creates missing tables, so databases created by older
+    versions are brought up to date here.
+    """
+    columns = {column["name"] for column in inspect(conn).get_columns("tasks")}
+
+    if "task_key_hash" not in columns:
+        conn.execute(text("ALTER TABLE tasks ADD COLUMN task_key_hash BIGINT"))
+        rows = conn.execute(text("SELECT id, task_key FROM tasks")).all()
+        if rows:
+            conn.execute(
+                text("UPDATE tasks SET task_key_hash = :task_key_hash WHERE id = :id"),
+                [
+                    {"id": row[0], "task_key_hash": task_key_hash(row[1])}
+                    for row in rows
+                ],
+            )
+
+    if "bvid" not in columns or "favid" not in columns:
+        if "bvid" not in columns:
+            conn.execute(text("ALTER TABLE tasks ADD COLUMN bvid VARCHAR(50)"))
+        if "favid" not in columns:
+            conn.execute(text("ALTER TABLE tasks ADD COLUMN favid VARCHAR(200)"))
+        conn.execute(
+            text(
+                "UPDATE tasks SET"
+                " bvid = json_extract(task_key, '$.bvid'),"
+                " favid = json_extract(task_key, '$.favid')"
+                " WHERE task_type = :task_type"
+            ),
+            {"task_type": TaskType.BILI_VIDEO.value},
+        )
+
+    # The (status, created_at) index covers lookups by status alone
+    conn.execute(text("DROP INDEX IF EXISTS ix_tasks_status"))
+
+    # Indexes of added columns are not created by create_all() either
+    for index in TaskModel.__table__.indexes:
+        index.create(conn, checkfirst=True)
+
+
+class _TaskSession(Session):
+    """Session running the callbacks queued by TaskDAL._after_commit."""
+
+
+@event.listens_for(_TaskSession, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    for callback in session.info.pop("after_commit", ()):
+        callback()
+
+
+@event.listens_for(_TaskSession, "after_soft_rollback")
+def _drop_after_commit(session: Session, previous_transaction: SessionTransaction):
+    if previous_transaction.parent is None:
+        session.info.pop("after_commit", None)
+
+
+def _is_memory_url(db_url: str) -> bool:
+    """Whether db_url points to an in-memory SQLite database."""
+    return ":memory:" in db_url or "mode=memory" in db_url
+
+
 class TaskDAL:
     """
     Data Access Layer for Task operations.
@@ -212,45 +523,108 @@ class TaskDAL:
     This is the base class with common task operations.
     """
 
-    def __init__(self, db_url: str = "sqlite+aiosqlite:///:memory:"):
+    # Number of rows fetched per batch when streaming large result sets
+    STREAM_YIELD_PER = 500
+    # Maximum number of values bound to a single IN clause, below the
+    # 999 variable limit of older SQLite builds
+    IN_CLAUSE_BATCH_SIZE = 900
+    # Prepared statements kept per SQLite connection
+    SQLITE_CACHED_STATEMENTS = 256
+
+    def __init__(
+        self, db_url: str = "sqlite+aiosqlite:///:memory:", fast_unsafe: bool = False
+    ):
         """
         Initialize the Task Data Access Layer.
 
         Args:
             db_url: Database URL for SQLAlchemy connection
+            fast_unsafe: Skip journaling and fsync on SQLite, so a crash can
+                corrupt the database. Only meant for throwaway databases
         """
         self.db_url = db_url
+        engine_kwargs: dict[str, Any] = {}
+        if not _is_memory_url(db_url):
+            # Reuse the most recently released connection first so that its
+            # page cache stays warm and idle overflow connections time out.
+            # In-memory databases use a StaticPool, which has no queue.
+            engine_kwargs["pool_use_lifo"] = True
+        if db_url.startswith("sqlite"):
+            # Keep more prepared statements per connection than sqlite3's
+            # default of 128, so every DAL statement stays prepared
+            engine_kwargs["connect_args"] = {
+                "cached_statements": self.SQLITE_CACHED_STATEMENTS
+            }
         self.engine = create_async_engine(
             db_url,
             echo=False,
             pool_pre_ping=True,
+            **engine_kwargs,
         )
 
         # Set up SQLite PRAGMA commands on new connections
         if db_url.startswith("sqlite"):
+            on_disk = not _is_memory_url(db_url)
 
             @event.listens_for(self.engine.sync_engine, "connect")
             def _set_sqlite_pragma(dbapi_conn, _connection_record):
                 """Set SQLite PRAGMA commands on new connections."""
                 cursor = dbapi_conn.cursor()
                 try:
-                    # Enable WAL mode for better concurrency
-                    cursor.execute("PRAGMA journal_mode=WAL;")
+                    if fast_unsafe:
+                        # Throwaway database: no durable journal, no fsync
+                        cursor.execute("PRAGMA journal_mode=MEMORY;")
+                        cursor.execute("PRAGMA synchronous=OFF;")
+                        cursor.execute("PRAGMA temp_store=MEMORY;")
+                        cursor.execute("PRAGMA mmap_size=268435456;")
+                    else:
+                        # Enable WAL mode for better concurrency
+                        cursor.execute("PRAGMA journal_mode=WAL;")
                     # Enable foreign keys
                     cursor.execute("PRAGMA foreign_keys=ON;")
                     # Set busy timeout to 20 seconds
                     cursor.execute("PRAGMA busy_timeout=20000;")
+                    if on_disk and not fast_unsafe:
+                        # Under WAL only checkpoints need to fsync
+                        cursor.execute("PRAGMA synchronous=NORMAL;")
+                        # 64 MiB page cache and 256 MiB memory-mapped I/O
+                        cursor.execute("PRAGMA cache_size=-65536;")
+                        cursor.execute("PRAGMA mmap_size=268435456;")
+                        # Keep temporary sort and group tables in RAM
+                        cursor.execute("PRAGMA temp_store=MEMORY;")
+                        cursor.execute("PRAGMA wal_autocheckpoint=1000;")
                 except Exception:
                     pass  # Ignore errors for non-SQLite databases
+                finally:
+                    cursor.close()
 
         self.async_session = async_sessionmaker(
-            self.engine, class_=AsyncSession, expire_on_commit=False
+            self.engine,
+            class_=AsyncSession,
+            sync_session_class=_TaskSession,
+            expire_on_commit=False,
         )
 
-    async def create_tables(self):
-        """Create all database tables."""
+    async def create_tables(self) -> str:
+        """
+        Create all database tables and upgrade tables of older databases.
+
+        Returns:
+            Journal mode of the connection the tables were created on
+        """
         async with self.engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_upgrade_tasks_table)
+            return await self._journal_mode(conn)
+
+    async def get_journal_mode(self) -> str:
+        """Get the SQLite journal mode, e.g. "wal" or "memory"."""
+        async with self.engine.connect() as conn:
+            return await self._journal_mode(conn)
+
+    @staticmethod
+    async def _journal_mode(conn: AsyncConnection) -> str:
+        return (await conn.execute(text("PRAGMA journal_mode"))).scalar_one()
 
     async def drop_tables(self):
         """Drop all database tables."""
@@ -261,26 +635,129 @@ class TaskDAL:
         """Get a new database session."""
         return self.async_session()
 
-    async def get_task_by_key(self, task_key: str) -> TaskModel | None:
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        """
+        Open a session that several DAL calls can share.
+
+        Pass it as ``session=`` to the methods accepting one; all of their
+        statements run in a single transaction, committed when the block
+        exits and rolled back if it raises. Status events and cache
+        invalidations of those calls are held back until the commit, and
+        dropped on rollback.
+        """
+        async with self.async_session() as session:
+            async with session.begin():
+                yield session
+
+    @asynccontextmanager
+    async def _session_scope(
+        self, session: AsyncSession | None
+    ) -> AsyncIterator[AsyncSession]:
+        """Use the caller's session, or a new one committed on exit."""
+        if session is not None:
+            yield session
+            return
+        async with self.session() as session:
+            yield session
+
+    @staticmethod
+    def _after_commit(
+        session: AsyncSession, callback: Callable[..., None], *args: Any
+    ) -> None:
+        """
+        Run callback once the transaction of session commits.
+
+        Any session of self.async_session runs the queue on commit and drops
+        it on rollback, not only those opened by session().
+        """
+        session.info.setdefault("after_commit", []).append(partial(callback, *args))
+
+    def _tasks_written(self, task_keys: Sequence[str]) -> None:
+        """Hook called after writes to the given tasks have been committed."""
+
+    async def get_task_by_key(
+        self, task_key: str, *, session: AsyncSession | None = None
+    ) -> TaskModel | None:
         """
         Get a task by its unique key.
 
         Args:
             task_key: Task key JSON string
+            session: Optional session shared with other calls
 
         Returns:
             TaskModel instance if found, None otherwise
         """
-        async with self.async_session() as session:
-            stmt = select(TaskModel).where(TaskModel.task_key == task_key)
-            result = await session.execute(stmt)
+        async with self._session_scope(session) as session:
+            stmt = lambda_stmt(
+                lambda: select(TaskModel).where(TaskModel.bound_key_clause())
+            )
+            result = await session.execute(stmt, TaskModel.key_params(task_key))
             return result.scalar_one_or_none()
 
+    async def get_task_by_id(
+        self, task_id: int, *, session: AsyncSession | None = None
+    ) -> TaskModel | None:
+        """
+        Get a task by its primary key.
+
+        Args:
+            task_id: Task ID
+            session: Optional session shared with other calls
+
+        Returns:
+            TaskModel instance if found, None otherwise
+        """
+        async with self._session_scope(session) as session:
+            return await session.get(TaskModel, task_id)
+
+    async def get_task_statuses(
+        self, task_keys: Sequence[str]
+    ) -> dict[str, TaskStatus]:
+        """
+        Get the statuses of several tasks in as few queries as possible.
+
+        Args:
+            task_keys: Task key JSON strings
+
+        Returns:
+            Mapping of task key to status, keys without a task are left out
+        """
+        statuses: dict[str, TaskStatus] = {}
+        # keys_clause binds every key twice, as key and as hash
+        step = self.IN_CLAUSE_BATCH_SIZE // 2
+        async with self.async_session() as session:
+            for start in range(0, len(task_keys), step):
+                batch = task_keys[start : start + step]
+                stmt = select(TaskModel.task_key, TaskModel.status).where(
+                    TaskModel.keys_clause()
+                )
+                result = await session.execute(stmt, TaskModel.keys_params(batch))
+                statuses.update(
+                    (task_key, TaskStatus(status)) for task_key, status in result.all()
+                )
+        return statuses
+
+    async def existing_task_keys(self, task_keys: Sequence[str]) -> set[str]:
+        """
+        Get which of several task keys already have a task.
+
+        Args:
+            task_keys: Task key JSON strings
+
+        Returns:
+            Set of the given task keys that exist
+        """
+        return set(await self.get_task_statuses(task_keys))
+
     async def update_task_status(
         self,
         task_key: str,
         status: TaskStatus,
         error_message: str | None = None,
+        *,
+        session: AsyncSession | None = None,
     ) -> TaskModel | None:
         """
         Update task status using native async update statement.
@@ -289,47 +766,86 @@ class TaskDAL:
             task_key: Task key JSON string
             status: New task status
             error_message: Optional error message for failed tasks
+            session: Optional session shared with other calls
 
         Returns:
             Updated TaskModel instance if found, None otherwise
         """
-        async with self.async_session() as session:
-            # Build update values
-            values: dict[str, Any] = {"status": status.value}
+        async with self._session_scope(session) as session:
+            # The statement is cached per branch, values are bound parameters
+            params = TaskModel.key_params(task_key)
+            params["new_status"] = status.value
+            stmt = lambda_stmt(
+                lambda: update(TaskModel).where(TaskModel.bound_key_clause())
+            )
             if status == TaskStatus.COMPLETED:
-                values["completed_at"] = datetime.now(timezone.utc)
-                values["error_message"] = None
+                # Stamped by SQLite like updated_at, in the same statement
+                stmt += lambda s: s.values(
+                    status=bindparam("new_status"),
+                    completed_at=_sql_utc_now(),
+                    error_message=None,
+                )
             elif status == TaskStatus.FAILED:
-                values["error_message"] = error_message
-
-            # Execute update statement
-            stmt = (
-                update(TaskModel)
-                .where(TaskModel.task_key == task_key)
-                .values(**values)
-                .returning(TaskModel)
+                params["new_error_message"] = error_message
+                stmt += lambda s: s.values(
+                    status=bindparam("new_status"),
+                    error_message=bindparam("new_error_message"),
+                )
+            else:
+                stmt += lambda s: s.values(status=bindparam("new_status"))
+            # The returned row is authoritative: in-session evaluation cannot
+            # see the bound values, so refresh loaded objects from it instead
+            stmt += lambda s: s.returning(TaskModel).execution_options(
+                synchronize_session=False, populate_existing=True
             )
-            result = await session.execute(stmt)
-            await session.commit()
 
+            # Execute update statement
+            result = await session.execute(stmt, params)
             task = result.scalars().first()
+
+            self._after_commit(session, self._tasks_written, [task_key])
             if task is not None:
-                self._publish_status_event(task, status, error_message)
-            return task
+                self._after_commit(
+                    session, self._publish_status_event, task, status, error_message
+                )
+        return task
+
+    @staticmethod
+    def _status_query(with_data: bool) -> StatementLambdaElement:
+        """
+        Build the cached query listing tasks with the bound "status".
+
+        Unless with_data is set, task_data is left out of the row and reading
+        it from a returned task raises instead of lazy loading.
+        """
+        stmt = lambda_stmt(
+            lambda: select(TaskModel).where(TaskModel.status == bindparam("status"))
+        )
+        if not with_data:
+            stmt += lambda s: s.options(defer(TaskModel.task_data, raiseload=True))
+        return stmt
 
-    async def get_tasks_by_status(self, status: TaskStatus) -> list[TaskModel]:
+    async def get_tasks_by_status(
+        self,
+        status: TaskStatus,
+        with_data: bool = False,
+        *,
+        session: AsyncSession | None = None,
+    ) -> list[TaskModel]:
         """
         Get all tasks with a specific status.
 
         Args:
             status: Task status to filter by
+            with_data: Whether to load task_data as well
+            session: Optional session shared with other calls
 
         Returns:
             List of TaskModel instances
         """
-        async with self.async_session() as session:
-            stmt = select(TaskModel).where(TaskModel.status == status.value)
-            result = await session.execute(stmt)
+        async with self._session_scope(session) as session:
+            stmt = self._status_query(with_data)
+            result = await session.execute(stmt, {"status": status.value})
             return list(result.scalars().all())
 
     async def get_ready_tasks(self, limit: int | None = None) -> list[TaskModel]:
@@ -343,13 +859,15 @@ class TaskDAL:
             List of ready TaskModel instances
         """
         async with self.async_session() as session:
-            stmt = (
-                select(TaskModel)
-                .where(TaskModel.status == TaskStatus.READY.value)
-                .order_by(TaskModel.created_at)
+            stmt = lambda_stmt(
+                lambda: (
+                    select(TaskModel)
+                    .where(TaskModel.status == TaskStatus.READY.value)
+                    .order_by(TaskModel.created_at)
+                )
             )
             if limit:
-                stmt = stmt.limit(limit)
+                stmt += lambda s: s.limit(limit)
 
             result = await session.execute(stmt)
             return list(result.scalars().all())
@@ -361,17 +879,16 @@ class TaskDAL:
         Returns:
             Dictionary with task counts by status
         """
-        async with self.async_session() as session:
-            stats = {status.value: 0 for status in TaskStatus}
+        stats = {status.value: 0 for status in TaskStatus}
 
-            for status in TaskStatus:
-                stmt = select(func.count(TaskModel.id)).where(
-                    TaskModel.status == status.value
-                )
-                result = await session.execute(stmt)
-                stats[status.value] = result.scalar() or 0
+        async with self.async_session() as session:
+            stmt = select(TaskModel.status, func.count()).group_by(TaskModel.status)
+            result = await session.execute(stmt)
+            for status, count in result.all():
+                if status in stats:
+                    stats[status] = count
 
-            return stats
+        return stats
 
     async def get_tasks_paginated(
         self,
@@ -383,6 +900,8 @@ class TaskDAL:
         Get paginated task list with optional status filter.
 
         Uses raw SQL to bypass SQLAlchemy's type cache issues.
+        Deep pages have to skip every preceding row, prefer
+        get_tasks_after for walking through large task lists.
 
         Args:
             page: Page number (1-indexed)
@@ -390,7 +909,8 @@ class TaskDAL:
             status: Optional status filter
 
         Returns:
-            Dictionary with 'items', 'total', 'page', 'page_size' keys
+            Dictionary with 'items', 'total', 'page', 'page_size' and
+            'next_cursor' keys
         """
         async with self.async_session() as session:
             # Build WHERE clause for status filter
@@ -400,66 +920,128 @@ class TaskDAL:
                 where_clause = "WHERE status = :status"
                 params["status"] = status
 
-            # Get total count
-            count_sql = text(f"SELECT COUNT(*) FROM tasks {where_clause}")
-            count_result = await session.execute(count_sql, params)
-            total = count_result.scalar() or 0
-
-            # Get paginated results
+            # Get paginated results along with the total count in one query
             query_sql = text(f"""
-                SELECT id, task_type, task_key, task_data, status,
-                       created_at, updated_at, completed_at, error_message
+                SELECT {", ".join(_TASK_COLUMNS)}, COUNT(*) OVER () AS total
                 FROM tasks
                 {where_clause}
-                ORDER BY created_at DESC
+                ORDER BY created_at DESC, id DESC
                 LIMIT :limit OFFSET :offset
             """)
             result = await session.execute(query_sql, params)
             rows = result.all()
 
-            # Convert rows to dict and format datetimes with timezone conversion
-            items = []
-            for row in rows:
-                # Parse string dates from SQLite and convert to target timezone
-                created_dt = datetime.fromisoformat(row[5]) if row[5] else None
-                updated_dt = datetime.fromisoformat(row[6]) if row[6] else None
-                completed_dt = datetime.fromisoformat(row[7]) if row[7] else None
-
-                items.append(
-                    {
-                        "id": row[0],
-                        "task_type": row[1],
-                        "task_key": row[2],
-                        "task_data": row[3],
-                        "status": row[4],
-                        "created_at": format_datetime(created_dt),
-                        "updated_at": format_datetime(updated_dt),
-                        "completed_at": format_datetime(completed_dt),
-                        "error_message": row[8],
-                    }
-                )
+            if rows:
+                total = rows[0][9]
+            else:
+                # Window columns are not available past the last page
+                count_sql = text(f"SELECT COUNT(*) FROM tasks {where_clause}")
+                count_result = await session.execute(count_sql, params)
+                total = count_result.scalar() or 0
 
             return {
-                "items": items,
+                "items": [self._row_to_dict(row) for row in rows],
                 "total": total,
                 "page": page,
                 "page_size": page_size,
+                "next_cursor": self._next_cursor(rows, page_size),
             }
 
-    def _task_to_dict(self, task: TaskModel) -> dict:
-        """Convert TaskModel to dictionary with timezone conversion."""
+    async def get_tasks_after(
+        self,
+        after_created_at: str | None = None,
+        after_id: int | None = None,
+        page_size: int = 20,
+        status: str | None = None,
+    ) -> dict:
+        """
+        Get a page of tasks following a cursor with optional status filter.
+
+        Seeks on the (created_at, id) order instead of skipping rows with
+        OFFSET, so every page costs the same regardless of its depth.
+
+        Args:
+            after_created_at: created_at value of the cursor, as returned in
+                'next_cursor' by the previous page
+            after_id: id value of the cursor
+            page_size: Number of items per page
+            status: Optional status filter
+
+        Returns:
+            Dictionary with 'items', 'page_size' and 'next_cursor' keys,
+            'next_cursor' is None on the last page
+        """
+        async with self.async_session() as session:
+            conditions = []
+            params: dict[str, Any] = {"limit": page_size}
+            if status:
+                conditions.append("status = :status")
+                params["status"] = status
+            if after_created_at is not None and after_id is not None:
+                conditions.append("(created_at, id) < (:after_created_at, :after_id)")
+                params["after_created_at"] = after_created_at
+                params["after_id"] = after_id
+            where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+            query_sql = text(f"""
+                SELECT {", ".join(_TASK_COLUMNS)}
+                FROM tasks
+                {where_clause}
+                ORDER BY created_at DESC, id DESC
+                LIMIT :limit
+            """)
+            result = await session.execute(query_sql, params)
+            rows = result.all()
+
+            return {
+                "items": [self._row_to_dict(row) for row in rows],
+                "page_size": page_size,
+                "next_cursor": self._next_cursor(rows, page_size),
+            }
+
+    @staticmethod
+    def _next_cursor(rows: Sequence[Row], page_size: int) -> dict | None:
+        """Build the keyset cursor pointing after the last row of a full page."""
+        if len(rows) < page_size:
+            return None
+        last = rows[-1]
+        return {"created_at": last[5], "id": last[0]}
+
+    @staticmethod
+    def _row_to_dict(row: Sequence[Any]) -> dict:
+        """
+        Convert task column values to dictionary with timezone conversion.
+
+        Accepts raw rows selected in _TASK_COLUMNS order, datetimes may be
+        either datetime objects or the strings stored by SQLite.
+        """
+        (
+            task_id,
+            task_type,
+            task_key,
+            task_data,
+            status,
+            created_at,
+            updated_at,
+            completed_at,
+            error_message,
+        ) = row[:9]
         return {
-            "id": task.id,
-            "task_type": task.task_type,
-            "task_key": task.task_key,
-            "task_data": task.task_data,
-            "status": task.status,
-            "created_at": format_datetime(task.created_at),
-            "updated_at": format_datetime(task.updated_at),
-            "completed_at": format_datetime(task.completed_at),
-            "error_message": task.error_message,
+            "id": task_id,
+            "task_type": task_type,
+            "task_key": task_key,
+            "task_data": task_data,
+            "status": status,
+            "created_at": _format_stored_datetime(created_at),
+            "updated_at": _format_stored_datetime(updated_at),
+            "completed_at": _format_stored_datetime(completed_at),
+            "error_message": error_message,
         }
 
+    def _task_to_dict(self, task: TaskModel) -> dict:
+        """Convert TaskModel to dictionary with timezone conversion."""
+        return self._row_to_dict(_TASK_ATTRS(task))
+
     def _publish_status_event(
         self,
         task: TaskModel,
@@ -486,25 +1068,54 @@ class TaskDAL:
             ),
         )
 
-    async def delete_task(self, task_key: str) -> bool:
+    async def delete_task(
+        self, task_key: str, *, session: AsyncSession | None = None
+    ) -> bool:
         """
         Delete a task by its unique key using native async delete statement.
 
         Args:
             task_key: Task key JSON string
+            session: Optional session shared with other calls
 
         Returns:
             True if task was deleted, False if not found
         """
-        async with self.async_session() as session:
-            stmt = (
-                delete(TaskModel)
-                .where(TaskModel.task_key == task_key)
-                .returning(TaskModel.id)
+        return await self.delete_tasks([task_key], session=session) > 0
+
+    async def delete_tasks(
+        self, task_keys: Sequence[str], *, session: AsyncSession | None = None
+    ) -> int:
+        """
+        Delete tasks by their unique keys in a single transaction.
+
+        Args:
+            task_keys: Task key JSON strings
+            session: Optional session shared with other calls
+
+        Returns:
+            Number of deleted tasks
+        """
+        if not task_keys:
+            return 0
+
+        deleted = 0
+        # keys_clause binds every key twice, as key and as hash
+        step = self.IN_CLAUSE_BATCH_SIZE // 2
+        async with self._session_scope(session) as session:
+            stmt = lambda_stmt(
+                lambda: (
+                    delete(TaskModel)
+                    .where(TaskModel.keys_clause())
+                    .execution_options(synchronize_session=False)
+                )
             )
-            result = await session.execute(stmt)
-            await session.commit()
-            return result.scalar_one_or_none() is not None
+            for start in range(0, len(task_keys), step):
+                batch = task_keys[start : start + step]
+                result = await session.execute(stmt, TaskModel.keys_params(batch))
+                deleted += result.rowcount
+            self._after_commit(session, self._tasks_written, list(task_keys))
+        return deleted
 
     async def close(self):
         """Close the database connection."""
@@ -516,47 +1127,195 @@ class BiliVideoTaskDAL(TaskDAL):
     Data Access Layer for Bilibili Video tasks.
 
     Extends TaskDAL with Bilibili video-specific operations.
+    Recently looked-up task statuses are kept in a bounded LRU cache which
+    is invalidated whenever a task is written through this DAL.
     """
 
+    # Maximum number of task statuses kept in the lookup cache
+    STATUS_CACHE_SIZE = 4096
+
+    def __init__(
+        self, db_url: str = "sqlite+aiosqlite:///:memory:", fast_unsafe: bool = False
+    ):
+        super().__init__(db_url, fast_unsafe)
+        self._status_cache: OrderedDict[str, TaskStatus] = OrderedDict()
+        # Bumped on every invalidation so that lookups racing with a write
+        # never put a stale status back into the cache
+        self._status_cache_epoch = 0
+
+    def _cache_task_status(self, task_key: str, status: TaskStatus, epoch: int) -> None:
+        """Remember a task status, evicting the least recently used entry."""
+        if epoch != self._status_cache_epoch:
+            return
+        self._status_cache[task_key] = status
+        self._status_cache.move_to_end(task_key)
+        if len(self._status_cache) > self.STATUS_CACHE_SIZE:
+            self._status_cache.popitem(last=False)
+
+    def _forget_task_status(self, task_key: str) -> None:
+        """Drop a cached task status after the task has been written."""
+        self._status_cache_epoch += 1
+        self._status_cache.pop(task_key, None)
+
+    def _clear_task_status_cache(self) -> None:
+        """Drop all cached task statuses."""
+        self._status_cache_epoch += 1
+        self._status_cache.clear()
+
+    def _tasks_written(self, task_keys: Sequence[str]) -> None:
+        for task_key in task_keys:
+            self._forget_task_status(task_key)
+
+    async def get_task_statuses(
+        self, task_keys: Sequence[str]
+    ) -> dict[str, TaskStatus]:
+        statuses: dict[str, TaskStatus] = {}
+        missing = []
+        for task_key in task_keys:
+            status = self._status_cache.get(task_key)
+            if status is None:
+                missing.append(task_key)
+            else:
+                self._status_cache.move_to_end(task_key)
+                statuses[task_key] = status
+
+        if missing:
+            epoch = self._status_cache_epoch
+            fetched = await super().get_task_statuses(missing)
+            for task_key, status in fetched.items():
+                self._cache_task_status(task_key, status, epoch)
+            statuses.update(fetched)
+        return statuses
+
     async def create_bili_video_task(
         self,
         bvid: str,
         favid: str,
         task_context: dict[str, Any],
-    ) -> TaskModel:
+        *,
+        session: AsyncSession | None = None,
+    ) -> TaskModel | None:
         """
         Create a new Bilibili video task.
 
+        The insert is skipped when a task with the same key already exists,
+        which SQLite resolves itself instead of raising an IntegrityError.
+
         Args:
             bvid: Video ID
             favid: Favorite list ID
             task_context: Task context dictionary
+            session: Optional session shared with other calls
 
         Returns:
-            Created TaskModel instance
+            Created TaskModel instance, None if the task already exists
         """
-        async with self.async_session() as session:
-            task = TaskModel.create_bili_video_task(bvid, favid, task_context)
-            session.add(task)
-            await session.commit()
-            await session.refresh(task)
-            self._publish_status_event(task, TaskStatus.READY)
-            return task
+        values = TaskModel.bili_video_task_values(bvid, favid, task_context)
+        async with self._session_scope(session) as session:
+            stmt = (
+                sqlite_insert(TaskModel)
+                .on_conflict_do_nothing(index_elements=["task_key"])
+                .returning(TaskModel)
+            )
+            result = await session.execute(stmt, values)
+            task = result.scalars().first()
+
+            if task is not None:
+                self._after_commit(session, self._tasks_written, [task.task_key])
+                self._after_commit(
+                    session, self._publish_status_event, task, TaskStatus.READY
+                )
+        return task
+
+    async def bulk_create_bili_video_tasks(
+        self,
+        tasks: Sequence[tuple[str, str, dict[str, Any]]],
+        *,
+        session: AsyncSession | None = None,
+    ) -> list[TaskModel]:
+        """
+        Create several Bilibili video tasks in one transaction.
 
-    async def has_bili_video_task(self, bvid: str, favid: str) -> bool:
+        Rows are inserted with a single multi-row statement; tasks that
+        already exist are skipped like in create_bili_video_task.
+
+        Args:
+            tasks: (bvid, favid, task_context) of each task
+            session: Optional session shared with other calls
+
+        Returns:
+            Created TaskModel instances
+        """
+        if not tasks:
+            return []
+
+        values = [
+            TaskModel.bili_video_task_values(bvid, favid, task_context)
+            for bvid, favid, task_context in tasks
+        ]
+        async with self._session_scope(session) as session:
+            stmt = (
+                sqlite_insert(TaskModel)
+                .on_conflict_do_nothing(index_elements=["task_key"])
+                .returning(TaskModel)
+            )
+            result = await session.execute(stmt, values)
+            created = list(result.scalars())
+
+            self._after_commit(
+                session, self._tasks_written, [task.task_key for task in created]
+            )
+            for task in created:
+                self._after_commit(
+                    session, self._publish_status_event, task, TaskStatus.READY
+                )
+        return created
+
+    async def has_bili_video_task(
+        self, bvid: str, favid: str, *, session: AsyncSession | None = None
+    ) -> bool:
         """
         Check if a Bilibili video task exists.
 
         Args:
             bvid: Video ID
             favid: Favorite list ID
+            session: Optional session shared with other calls
 
         Returns:
             True if task exists, False otherwise
         """
         task_key = make_bili_video_key(bvid, favid)
-        task = await self.get_task_by_key(task_key)
-        return task is not None
+        # A shared transaction may have written the task since it was cached
+        if session is None and task_key in self._status_cache:
+            return True
+
+        async with self._session_scope(session) as session:
+            stmt = lambda_stmt(
+                lambda: (
+                    select(TaskModel.id).where(TaskModel.bound_key_clause()).limit(1)
+                )
+            )
+            result = await session.execute(stmt, TaskModel.key_params(task_key))
+            return result.scalar() is not None
+
+    async def existing_bili_video_keys(
+        self, keys: Sequence[tuple[str, str]]
+    ) -> set[tuple[str, str]]:
+        """
+        Get which of several Bilibili video tasks exist in one lookup.
+
+        Args:
+            keys: (bvid, favid) of each task
+
+        Returns:
+            Set of the given (bvid, favid) pairs that have a task
+        """
+        task_keys = {
+            make_bili_video_key(bvid, favid): (bvid, favid) for bvid, favid in keys
+        }
+        existing = await self.existing_task_keys(list(task_keys))
+        return {task_keys[task_key] for task_key in existing}
 
     async def get_bili_video_task_status(
         self, bvid: str, favid: str
@@ -572,10 +1331,22 @@ class BiliVideoTaskDAL(TaskDAL):
             TaskStatus if task exists, None otherwise
         """
         task_key = make_bili_video_key(bvid, favid)
-        task = await self.get_task_by_key(task_key)
-        if task is None:
+        status = self._status_cache.get(task_key)
+        if status is not None:
+            self._status_cache.move_to_end(task_key)
+            return status
+
+        epoch = self._status_cache_epoch
+        async with self.async_session() as session:
+            stmt = select(TaskModel.status).where(TaskModel.key_clause(task_key))
+            result = await session.execute(stmt)
+            value = result.scalar_one_or_none()
+
+        if value is None:
             return None
-        return TaskStatus(task.status)
+        status = TaskStatus(value)
+        self._cache_task_status(task_key, status, epoch)
+        return status
 
     async def delete_stale_tasks(
         self, downloaded_bvids: set[str], favid: str
@@ -590,33 +1361,38 @@ class BiliVideoTaskDAL(TaskDAL):
         Returns:
             List of deleted task keys (bvid, favid)
         """
-        deleted_keys = []
+        if not downloaded_bvids:
+            return []
 
-        async with self.async_session() as session:
-            # Get all ready, consuming or downloading Bilibili video tasks
-            stmt = select(TaskModel).where(
-                TaskModel.task_type == TaskType.BILI_VIDEO.value,
-                TaskModel.status.in_(
-                    [
-                        TaskStatus.READY.value,
-                        TaskStatus.CONSUMING.value,
-                        TaskStatus.DOWNLOADING.value,
-                    ]
-                ),
-            )
-            result = await session.execute(stmt)
-            tasks = list(result.scalars().all())
-
-            for task in tasks:
-                key_dict = task.key_dict
-                if (
-                    key_dict.get("favid") == favid
-                    and key_dict.get("bvid") in downloaded_bvids
-                ):
-                    deleted_keys.append((key_dict["bvid"], key_dict["favid"]))
-                    await session.delete(task)
-
-            await session.commit()
+        bvids = list(downloaded_bvids)
+        deleted_keys = []
+        try:
+            async with self.async_session() as session:
+                # One DELETE per batch of bvids, all in a single transaction
+                for start in range(0, len(bvids), self.IN_CLAUSE_BATCH_SIZE):
+                    batch = bvids[start : start + self.IN_CLAUSE_BATCH_SIZE]
+                    stmt = (
+                        delete(TaskModel)
+                        .where(
+                            TaskModel.favid == favid,
+                            TaskModel.bvid.in_(batch),
+                            TaskModel.status.in_(
+                                [
+                                    TaskStatus.READY.value,
+                                    TaskStatus.CONSUMING.value,
+                                    TaskStatus.DOWNLOADING.value,
+                                ]
+                            ),
+                        )
+                        .returning(TaskModel.bvid)
+                        .execution_options(synchronize_session=False)
+                    )
+                    result = await session.execute(stmt)
+                    deleted_keys.extend((bvid, favid) for bvid in result.scalars())
+                await session.commit()
+        finally:
+            for bvid, _ in deleted_keys:
+                self._forget_task_status(make_bili_video_key(bvid, favid))
 
         return deleted_keys
 
@@ -631,19 +1407,16 @@ class BiliVideoTaskDAL(TaskDAL):
             Set of completed bvids
         """
         async with self.async_session() as session:
-            stmt = select(TaskModel).where(
-                TaskModel.task_type == TaskType.BILI_VIDEO.value,
-                TaskModel.status == TaskStatus.COMPLETED.value,
+            stmt = (
+                select(TaskModel.bvid)
+                .where(
+                    TaskModel.favid == favid,
+                    TaskModel.status == TaskStatus.COMPLETED.value,
+                )
+                .execution_options(yield_per=self.STREAM_YIELD_PER)
             )
-            result = await session.execute(stmt)
-            tasks = list(result.scalars().all())
-
-            # Filter by favid and extract bvids
-            return {
-                task.key_dict["bvid"]
-                for task in tasks
-                if task.key_dict.get("favid") == favid
-            }
+            result = await session.stream_scalars(stmt)
+            return {bvid async for bvid in result}
 
     async def update_bili_video_task(
         self,
@@ -665,21 +1438,28 @@ class BiliVideoTaskDAL(TaskDAL):
             Updated TaskModel instance if found, None otherwise
         """
         task_key = make_bili_video_key(bvid, favid)
+        task_data = await _serialize_ctx(task_context)
+        values: dict[str, Any] = {"task_data": task_data}
+        if reset_status:
+            values["status"] = TaskStatus.READY.value
+            values["error_message"] = None
+
         async with self.async_session() as session:
-            stmt = select(TaskModel).where(TaskModel.task_key == task_key)
+            # RETURNING hands back the updated row, so neither a SELECT
+            # before the update nor a refresh after it is needed
+            stmt = (
+                update(TaskModel)
+                .where(TaskModel.key_clause(task_key))
+                .values(**values)
+                .returning(TaskModel)
+            )
             result = await session.execute(stmt)
-            task = result.scalar_one_or_none()
+            await session.commit()
+            self._forget_task_status(task_key)
 
+            task = result.scalars().first()
             if task is None:
                 return None
-
-            task.task_data = json.dumps(task_context)
-            if reset_status:
-                task.status = TaskStatus.READY.value
-                task.error_message = None
-
-            await session.commit()
-            await session.refresh(task)
             if reset_status:
                 self._publish_status_event(task, TaskStatus.READY)
             return task
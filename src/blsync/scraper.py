@@ -51,6 +51,23 @@ class BScraper:
                     continue
                 yield bvid, task_name
 
+    async def get_all_bvids_batched(
+        self, batch_size: int = 100
+    ) -> AsyncGenerator[list[tuple[str, str]], None]:
+        """
+        按批次获取所有收藏夹的视频，便于调用方批量查询数据库
+
+        :param batch_size: 每批最多包含的 (bvid, task_name) 数量
+        """
+        batch: list[tuple[str, str]] = []
+        async for item in self.get_all_bvids():
+            batch.append(item)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
     # async def get_video_info(self, bvid):
     #     v = video.Video(bvid=bvid, credential=self.credential)
     #     v_raw = await v.get_info()
@@ -0,0 +1,76 @@
+import os
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+
+import pytest
+from sqlalchemy import event
+
+from blsync.configs import Config, load_configs
+from blsync.model.task import BiliVideoTaskDAL
+from blsync.scraper import BScraper
+
+# Set at collection time so the app lifespan skips background tasks
+os.environ["TESTING"] = "1"
+
+
+@pytest.fixture(scope="session")
+def my_config() -> Config:
+    return load_configs([])
+
+
+@pytest.fixture(scope="session")
+def scraper(my_config: Config) -> BScraper:
+    return BScraper(my_config)
+
+
+def _make_rolled_back_dal() -> BiliVideoTaskDAL:
+    """Create an in-memory DAL where SQLAlchemy emits BEGIN itself.
+
+    Savepoints then nest inside the per-test transaction rather than the
+    driver's implicit one.
+    """
+    dal = BiliVideoTaskDAL("sqlite+aiosqlite:///:memory:", fast_unsafe=True)
+
+    @event.listens_for(dal.engine.sync_engine, "connect")
+    def _disable_driver_transactions(dbapi_conn, _connection_record):
+        dbapi_conn.isolation_level = None
+
+    @event.listens_for(dal.engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    return dal
+
+
+@asynccontextmanager
+async def _rolled_back(dal: BiliVideoTaskDAL) -> AsyncIterator[BiliVideoTaskDAL]:
+    """Run the DAL inside a transaction that is rolled back on exit.
+
+    Sessions opened by the DAL join the outer transaction through savepoints,
+    so their commits never reach the database.
+    """
+    async with dal.engine.connect() as conn:
+        trans = await conn.begin()
+        dal.async_session.configure(bind=conn, join_transaction_mode="create_savepoint")
+        try:
+            yield dal
+        finally:
+            dal.async_session.configure(
+                bind=dal.engine, join_transaction_mode="conservative_savepoint"
+            )
+            dal._clear_task_status_cache()
+            await trans.rollback()
+
+
+@pytest.fixture(scope="session")
+def make_rolled_back_dal() -> Callable[[], BiliVideoTaskDAL]:
+    """Factory for in-memory DALs that rolled_back can isolate."""
+    return _make_rolled_back_dal
+
+
+@pytest.fixture(scope="session")
+def rolled_back() -> Callable[
+    [BiliVideoTaskDAL], AbstractAsyncContextManager[BiliVideoTaskDAL]
+]:
+    """Context manager rolling back everything a DAL wrote inside it."""
+    return _rolled_back
@@ -1,14 +1,13 @@
 """Test FastAPI routes and endpoints."""
 
 import asyncio
-from contextlib import asynccontextmanager
-from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
+from blsync.database import get_task_dal
 from blsync.main import app
-from blsync.model.task import BiliVideoTaskDAL, TaskStatus
+from blsync.model.task import TaskStatus
 from blsync.progress import (
     DownloadProgressEvent,
     ProgressEventType,
@@ -16,71 +15,119 @@ from blsync.progress import (
 )
 
 
-@pytest.fixture
-def test_dal():
-    """Create test database access layer with in-memory database."""
-    dal = BiliVideoTaskDAL("sqlite+aiosqlite:///:memory:")
-    asyncio.run(dal.create_tables())
+@pytest.fixture(scope="session")
+def run_async():
+    """Run coroutines from synchronous tests on one event loop per session."""
+    with asyncio.Runner() as runner:
+        yield runner.run
+
+
+@pytest.fixture(scope="session")
+def session_dal(run_async, make_rolled_back_dal):
+    """Create the in-memory test database once for the whole session."""
+    dal = make_rolled_back_dal()
+    run_async(dal.create_tables())
     yield dal
-    asyncio.run(dal.close())
+    run_async(dal.close())
 
 
 @pytest.fixture
-def test_client(test_dal):
-    """Create test client with mocked database."""
-    # Patch get_task_dal to return test database
-    with patch("blsync.api.get_task_dal", return_value=test_dal):
-        with patch("blsync.main.get_task_dal", return_value=test_dal):
-            with patch("blsync.database._task_dal", test_dal):
-                yield TestClient(app)
+def test_dal(session_dal, run_async, rolled_back):
+    """Provide the shared test database, rolled back after each test.
+
+    The transaction is opened on the ``run_async`` loop and entered and exited
+    across separate calls, since sync tests drive the DAL through it.
+    """
+    scope = rolled_back(session_dal)
+    run_async(scope.__aenter__())
+    yield session_dal
+    run_async(scope.__aexit__(None, None, None))
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Create a test client shared by the whole session.
+
+    Entering it keeps one portal and event loop for every request; with
+    TESTING set the lifespan starts no background tasks.
+    """
+    with TestClient(app) as c:
+        yield c
 
 
 @pytest.fixture
-def mock_scraper():
-    """Create mock BScraper for video info tests."""
-    scraper_instance = MagicMock()
-    scraper_instance.get_video_info = AsyncMock()
-    with patch("blsync.api.get_global_configs") as mock_config:
-        mock_config.return_value = MagicMock()  # Mock config
-        with patch("blsync.api.BScraper", return_value=scraper_instance):
-            yield scraper_instance
+def test_client(client, test_dal):
+    """Use the shared test client with the test database."""
+    app.dependency_overrides[get_task_dal] = lambda: test_dal
+    yield client
+    app.dependency_overrides.pop(get_task_dal, None)
+
+
+class FakeBScraper:
+    """Stand-in for BScraper that returns a preset video info payload."""
+
+    def __init__(self, video_info: dict | None = None):
+        self.video_info = video_info
+
+    async def get_video_info(self, bvid: str) -> dict | None:
+        return self.video_info
+
+
+@pytest.fixture
+def fake_scraper(monkeypatch):
+    """Patch the API to build a FakeBScraper for video info tests."""
+    scraper = FakeBScraper()
+    monkeypatch.setattr("blsync.api.get_global_configs", lambda: None)
+    monkeypatch.setattr("blsync.api.BScraper", lambda config: scraper)
+    return scraper
+
+
+@pytest.fixture
+def static_dir(tmp_path, monkeypatch):
+    """Point the frontend routes at an empty temporary static directory."""
+    directory = tmp_path / "static"
+    directory.mkdir()
+    monkeypatch.setattr("blsync.api.STATIC_DIR", directory)
+    return directory
 
 
 class TestReadRoot:
     """Tests for GET / endpoint."""
 
-    def test_read_root_with_static_file(self, test_dal, tmp_path):
+    def test_read_root_with_static_file(self, client, static_dir):
         """Test returning frontend page when static file exists."""
-        # Create a temporary static directory with index.html
-        static_dir = tmp_path / "static"
-        static_dir.mkdir()
-        index_file = static_dir / "index.html"
-        index_file.write_text("<html><body>Test Page</body></html>")
+        (static_dir / "index.html").write_text("<html><body>Test Page</body></html>")
 
-        with patch("blsync.api.get_task_dal", return_value=test_dal):
-            with patch("blsync.api.STATIC_DIR", static_dir):
-                client = TestClient(app)
-                response = client.get("/")
+        response = client.get("/")
 
         assert response.status_code == 200
         assert response.headers["content-type"] == "text/html; charset=utf-8"
         assert b"Test Page" in response.content
 
-    def test_read_root_without_static_file(self, test_dal, tmp_path):
+    def test_read_root_without_static_file(self, client, static_dir):
         """Test 404 when static file doesn't exist."""
-        # Use a real directory that exists but has no index.html
-        empty_dir = tmp_path / "empty_static"
-        empty_dir.mkdir()
-
-        with patch("blsync.api.get_task_dal", return_value=test_dal):
-            with patch("blsync.api.STATIC_DIR", empty_dir):
-                client = TestClient(app)
-                response = client.get("/")
+        response = client.get("/")
 
         assert response.status_code == 404
         assert "not found" in response.json()["detail"].lower()
 
 
+class TestLifespan:
+    """Tests for the application lifespan."""
+
+    def test_lifespan_skips_background_tasks_when_testing(self, monkeypatch):
+        """Test that TESTING keeps the lifespan from starting background tasks."""
+        started = []
+        monkeypatch.setattr(
+            "blsync.main.start_background_tasks", lambda: started.append(True)
+        )
+
+        with TestClient(app):
+            pass
+
+        assert started == []
+
+
 class TestCreateTask:
     """Tests for POST /task/bili endpoint."""
 
@@ -119,17 +166,17 @@ class TestCreateTask:
         assert "updated" in data["message"].lower()
         assert isinstance(data["task_id"], int)
 
-    def test_create_task_already_completed(self, test_client, test_dal):
-        """Test creating a task that already exists with DONE status."""
+    def test_create_task_already_completed(self, test_client, test_dal, run_async):
+        """Test creating a task that already exists with COMPLETED status."""
         task_data = {
             "bid": "BV123456",
             "favid": "fav123",
         }
 
         # Create a done task
-        asyncio.run(test_dal.create_bili_video_task("BV123456", "fav123", {}))
+        run_async(test_dal.create_bili_video_task("BV123456", "fav123", {}))
         task_key = '{"bvid": "BV123456", "favid": "fav123"}'
-        asyncio.run(test_dal.update_task_status(task_key, TaskStatus.DONE))
+        run_async(test_dal.update_task_status(task_key, TaskStatus.COMPLETED))
 
         # Try to create same task again
         # API first checks has_bili_video_task, which returns True for completed tasks
@@ -177,34 +224,34 @@ class TestGetTaskStatus:
         assert data["ready"] == 0
         assert data["consuming"] == 0
         assert data["downloading"] == 0
-        assert data["done"] == 0
+        assert data["completed"] == 0
         assert data["failed"] == 0
 
-    def test_get_task_status_with_tasks(self, test_client, test_dal):
+    def test_get_task_status_with_tasks(self, test_client, test_dal, run_async):
         """Test getting task status with multiple tasks."""
         # Create tasks with different statuses
-        asyncio.run(test_dal.create_bili_video_task("BV1", "fav1", {}))
-        asyncio.run(test_dal.create_bili_video_task("BV2", "fav2", {}))
-        asyncio.run(test_dal.create_bili_video_task("BV3", "fav3", {}))
-        asyncio.run(test_dal.create_bili_video_task("BV4", "fav4", {}))
+        run_async(test_dal.create_bili_video_task("BV1", "fav1", {}))
+        run_async(test_dal.create_bili_video_task("BV2", "fav2", {}))
+        run_async(test_dal.create_bili_video_task("BV3", "fav3", {}))
+        run_async(test_dal.create_bili_video_task("BV4", "fav4", {}))
 
         # Update statuses
-        asyncio.run(
+        run_async(
             test_dal.update_task_status(
-                '{"bvid": "BV1", "favid": "fav1"}', TaskStatus.DONE
+                '{"bvid": "BV1", "favid": "fav1"}', TaskStatus.COMPLETED
             )
         )
-        asyncio.run(
+        run_async(
             test_dal.update_task_status(
                 '{"bvid": "BV2", "favid": "fav2"}', TaskStatus.FAILED, "Test error"
             )
         )
-        asyncio.run(
+        run_async(
             test_dal.update_task_status(
                 '{"bvid": "BV3", "favid": "fav3"}', TaskStatus.CONSUMING
             )
         )
-        asyncio.run(
+        run_async(
             test_dal.update_task_status(
                 '{"bvid": "BV4", "favid": "fav4"}', TaskStatus.DOWNLOADING
             )
@@ -217,16 +264,16 @@ class TestGetTaskStatus:
         assert data["ready"] == 0
         assert data["consuming"] == 1
         assert data["downloading"] == 1
-        assert data["done"] == 1
+        assert data["completed"] == 1
         assert data["failed"] == 1
 
 
 class TestGetVideoInfo:
     """Tests for GET /api/video/info endpoint."""
 
-    def test_get_video_info_success(self, test_client, mock_scraper):
+    def test_get_video_info_success(self, test_client, fake_scraper):
         """Test getting video info successfully."""
-        mock_scraper.get_video_info.return_value = {
+        fake_scraper.video_info = {
             "title": "Test Video",
             "pic": "https://example.com/pic.jpg",
             "desc": "Test description",
@@ -253,16 +300,11 @@ class TestGetVideoInfo:
         assert len(data["pages"]) == 2
         assert data["owner"]["name"] == "Test User"
 
-    def test_get_video_info_not_found(self, test_dal):
+    def test_get_video_info_not_found(self, test_client, fake_scraper):
         """Test getting video info for non-existent video."""
-        with patch("blsync.api.get_global_configs") as mock_config:
-            mock_config.return_value = MagicMock()
-            mock_scraper = MagicMock()
-            mock_scraper.get_video_info = AsyncMock(return_value=None)
-            with patch("blsync.api.BScraper", return_value=mock_scraper):
-                with patch("blsync.api.get_task_dal", return_value=test_dal):
-                    client = TestClient(app)
-                    response = client.get("/api/video/info?bvid=INVALID")
+        fake_scraper.video_info = None
+
+        response = test_client.get("/api/video/info?bvid=INVALID")
 
         assert response.status_code == 404
         assert (
@@ -292,11 +334,14 @@ class TestGetTasks:
         assert data["page"] == 1
         assert data["page_size"] == 20
 
-    def test_get_tasks_with_pagination(self, test_client, test_dal):
+    def test_get_tasks_with_pagination(self, test_client, test_dal, run_async):
         """Test getting tasks with pagination."""
         # Create 25 tasks
-        for i in range(25):
-            asyncio.run(test_dal.create_bili_video_task(f"BV{i}", "fav1", {}))
+        run_async(
+            test_dal.bulk_create_bili_video_tasks(
+                [(f"BV{i}", "fav1", {}) for i in range(25)]
+            )
+        )
 
         # Get first page (default page_size=20)
         response = test_client.get("/api/tasks?page=1&page_size=10")
@@ -308,32 +353,77 @@ class TestGetTasks:
         assert data["page"] == 1
         assert data["page_size"] == 10
 
-    def test_get_tasks_with_status_filter(self, test_client, test_dal):
+        # Total is still reported past the last page
+        response = test_client.get("/api/tasks?page=4&page_size=10")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["items"] == []
+        assert data["total"] == 25
+
+    def test_get_tasks_with_cursor(self, test_client, test_dal, run_async):
+        """Test walking through all tasks with the keyset cursor."""
+        run_async(
+            test_dal.bulk_create_bili_video_tasks(
+                [(f"BV{i}", "fav1", {}) for i in range(25)]
+            )
+        )
+
+        response = test_client.get("/api/tasks?page_size=10")
+        data = response.json()
+        seen = [item["id"] for item in data["items"]]
+        cursor = data["next_cursor"]
+
+        while cursor is not None:
+            response = test_client.get(
+                "/api/tasks",
+                params={
+                    "page_size": 10,
+                    "after_created_at": cursor["created_at"],
+                    "after_id": cursor["id"],
+                },
+            )
+            assert response.status_code == 200
+            data = response.json()
+            seen.extend(item["id"] for item in data["items"])
+            cursor = data["next_cursor"]
+
+        assert len(seen) == 25
+        assert len(set(seen)) == 25
+
+    def test_get_tasks_with_partial_cursor(self, test_client):
+        """Test cursor parameters must be provided together."""
+        response = test_client.get("/api/tasks?after_id=1")
+
+        assert response.status_code == 400
+
+    def test_get_tasks_with_status_filter(self, test_client, test_dal, run_async):
         """Test getting tasks filtered by status."""
         # Create tasks with different statuses
-        asyncio.run(test_dal.create_bili_video_task("BV1", "fav1", {}))
-        asyncio.run(test_dal.create_bili_video_task("BV2", "fav2", {}))
-        asyncio.run(test_dal.create_bili_video_task("BV3", "fav3", {}))
+        run_async(test_dal.create_bili_video_task("BV1", "fav1", {}))
+        run_async(test_dal.create_bili_video_task("BV2", "fav2", {}))
+        run_async(test_dal.create_bili_video_task("BV3", "fav3", {}))
 
         # Update statuses
-        asyncio.run(
+        run_async(
             test_dal.update_task_status(
-                '{"bvid": "BV1", "favid": "fav1"}', TaskStatus.DONE
+                '{"bvid": "BV1", "favid": "fav1"}', TaskStatus.COMPLETED
             )
         )
-        asyncio.run(
+        run_async(
             test_dal.update_task_status(
                 '{"bvid": "BV2", "favid": "fav2"}', TaskStatus.FAILED, "Test error"
             )
         )
 
-        # Filter by done status
-        response = test_client.get("/api/tasks?status=done")
+        # Filter by completed status
+        response = test_client.get("/api/tasks?status=completed")
 
         assert response.status_code == 200
         data = response.json()
         assert len(data["items"]) == 1
-        assert data["items"][0]["status"] == "done"
+        assert data["total"] == 1
+        assert data["items"][0]["status"] == "completed"
 
     def test_get_tasks_invalid_status(self, test_client):
         """Test getting tasks with invalid status filter."""
@@ -362,60 +452,30 @@ class TestGetTasks:
 class TestGetTaskDetail:
     """Tests for GET /api/tasks/{task_id} endpoint."""
 
-    def test_get_task_detail_success(self, test_dal):
+    def test_get_task_detail_success(self, test_client, test_dal, run_async):
         """Test getting task detail successfully."""
         # Create a task
-        task = asyncio.run(
+        task = run_async(
             test_dal.create_bili_video_task("BV123456", "fav123", {"title": "Test"})
         )
 
-        # Create a proper async context manager mock
-        @asynccontextmanager
-        async def mock_session_cm():
-            mock_session = MagicMock()
-            mock_result = MagicMock()
-            mock_result.scalar_one_or_none = MagicMock(return_value=task)
-            mock_session.execute = AsyncMock(return_value=mock_result)
-            yield mock_session
-
-        mock_get_session = MagicMock(return_value=mock_session_cm())
-
-        with patch.object(test_dal, "get_session", mock_get_session):
-            with patch("blsync.api.get_task_dal", return_value=test_dal):
-                client = TestClient(app)
-                response = client.get(f"/api/tasks/{task.id}")
+        response = test_client.get(f"/api/tasks/{task.id}")
 
         assert response.status_code == 200
         data = response.json()
         assert data["id"] == task.id
         assert data["status"] == "ready"
 
-    def test_get_task_detail_not_found(self, test_dal):
+    def test_get_task_detail_not_found(self, test_client):
         """Test getting detail for non-existent task."""
-
-        # Create a proper async context manager mock
-        @asynccontextmanager
-        async def mock_session_cm():
-            mock_session = MagicMock()
-            mock_result = MagicMock()
-            mock_result.scalar_one_or_none = MagicMock(return_value=None)
-            mock_session.execute = AsyncMock(return_value=mock_result)
-            yield mock_session
-
-        mock_get_session = MagicMock(return_value=mock_session_cm())
-
-        with patch.object(test_dal, "get_session", mock_get_session):
-            with patch("blsync.api.get_task_dal", return_value=test_dal):
-                client = TestClient(app)
-                response = client.get("/api/tasks/99999")
+        response = test_client.get("/api/tasks/99999")
 
         assert response.status_code == 404
         assert "not found" in response.json()["detail"].lower()
 
-    def test_get_task_detail_invalid_id(self):
+    def test_get_task_detail_invalid_id(self, test_client):
         """Test getting task detail with invalid ID format."""
-        client = TestClient(app)
-        response = client.get("/api/tasks/invalid")
+        response = test_client.get("/api/tasks/invalid")
 
         assert (
             response.status_code == 422
@@ -425,7 +485,6 @@ class TestGetTaskDetail:
 class TestTaskEvents:
     """Tests for GET /api/tasks/{task_id}/events endpoint."""
 
-    @pytest.mark.asyncio
     async def test_stream_task_events_replays_latest_snapshot(self, test_dal):
         from blsync.api import stream_task_events
 
@@ -441,27 +500,24 @@ class TestTaskEvents:
             ),
         )
 
-        with patch("blsync.api.get_task_dal", return_value=test_dal):
-            response = await stream_task_events(task.id)
-            first_chunk = await anext(response.body_iterator)
-            await response.body_iterator.aclose()
+        response = await stream_task_events(task.id, test_dal)
+        first_chunk = await anext(response.body_iterator)
+        await response.body_iterator.aclose()
 
         assert first_chunk.startswith("event: progress")
         assert '"overall_percent": 50.0' in first_chunk
 
-    @pytest.mark.asyncio
     async def test_stream_task_events_closes_cleanly_while_waiting(self, test_dal):
         from blsync.api import stream_task_events
 
         task = await test_dal.create_bili_video_task("BV123456", "fav123", {})
 
-        with patch("blsync.api.get_task_dal", return_value=test_dal):
-            response = await stream_task_events(task.id)
-            stream_task = asyncio.create_task(anext(response.body_iterator))
-            await asyncio.sleep(0)
-            stream_task.cancel()
-            with pytest.raises(asyncio.CancelledError):
-                await stream_task
+        response = await stream_task_events(task.id, test_dal)
+        stream_task = asyncio.create_task(anext(response.body_iterator))
+        await asyncio.sleep(0)
+        stream_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await stream_task
 
         assert stream_task.cancelled()
 
@@ -469,157 +525,83 @@ class TestTaskEvents:
 class TestUpdateTaskStatus:
     """Tests for PUT /api/tasks/{task_id}/status endpoint."""
 
-    def _create_mock_session(self, task=None):
-        """Helper to create a mock session for tests."""
-
-        @asynccontextmanager
-        async def mock_session_cm():
-            mock_session = MagicMock()
-
-            # Setup execute to return a mock result
-            mock_result = MagicMock()
-            mock_result.scalar_one_or_none = MagicMock(return_value=task)
-            mock_session.execute = AsyncMock(return_value=mock_result)
-            mock_session.commit = AsyncMock()
-            mock_session.refresh = AsyncMock()
-            mock_session.add = MagicMock()
-            yield mock_session
-
-        return mock_session_cm()
-
-    def test_update_status_to_ready(self, test_dal):
-        """Test updating task status to ready."""
-        # Create a task
-        task = asyncio.run(test_dal.create_bili_video_task("BV123456", "fav123", {}))
-
-        mock_get_session = MagicMock(return_value=self._create_mock_session(task))
-
-        with patch.object(test_dal, "get_session", mock_get_session):
-            with patch("blsync.api.get_task_dal", return_value=test_dal):
-                client = TestClient(app)
-                response = client.put(
-                    f"/api/tasks/{task.id}/status", json={"status": "ready"}
-                )
-
-        assert response.status_code == 200
-
-    def test_update_status_to_consuming(self, test_dal):
-        """Test updating task status to consuming."""
-        # Create a task
-        task = asyncio.run(test_dal.create_bili_video_task("BV123456", "fav123", {}))
-
-        mock_get_session = MagicMock(return_value=self._create_mock_session(task))
-
-        with patch.object(test_dal, "get_session", mock_get_session):
-            with patch("blsync.api.get_task_dal", return_value=test_dal):
-                client = TestClient(app)
-                response = client.put(
-                    f"/api/tasks/{task.id}/status", json={"status": "consuming"}
-                )
-
-        assert response.status_code == 200
-
-    def test_update_status_to_done(self, test_dal):
-        """Test updating task status to done."""
-        # Create a task
-        task = asyncio.run(test_dal.create_bili_video_task("BV123456", "fav123", {}))
-
-        mock_get_session = MagicMock(return_value=self._create_mock_session(task))
-
-        with patch.object(test_dal, "get_session", mock_get_session):
-            with patch("blsync.api.get_task_dal", return_value=test_dal):
-                client = TestClient(app)
-                response = client.put(
-                    f"/api/tasks/{task.id}/status", json={"status": "done"}
-                )
-
-        assert response.status_code == 200
-
-    def test_update_status_to_failed_with_error_message(self, test_dal):
-        """Test updating task status to failed with error message."""
-        # Create a task
-        task = asyncio.run(test_dal.create_bili_video_task("BV123456", "fav123", {}))
-
-        mock_get_session = MagicMock(return_value=self._create_mock_session(task))
-
-        with patch.object(test_dal, "get_session", mock_get_session):
-            with patch("blsync.api.get_task_dal", return_value=test_dal):
-                client = TestClient(app)
-                response = client.put(
-                    f"/api/tasks/{task.id}/status",
-                    json={"status": "failed", "error_message": "Download failed"},
-                )
+    @pytest.mark.parametrize(
+        "body",
+        [
+            {"status": "ready"},
+            {"status": "consuming"},
+            {"status": "downloading"},
+            {"status": "completed"},
+            {"status": "failed", "error_message": "Download failed"},
+        ],
+        ids=lambda body: body["status"],
+    )
+    def test_update_status(self, test_client, test_dal, run_async, body):
+        """Test updating task status to each valid status."""
+        task = run_async(test_dal.create_bili_video_task("BV123456", "fav123", {}))
+
+        response = test_client.put(f"/api/tasks/{task.id}/status", json=body)
 
         assert response.status_code == 200
+        assert response.json()["status"] == body["status"]
+        stored = run_async(test_dal.get_task_by_id(task.id))
+        assert stored.status == TaskStatus(body["status"])
+        assert stored.error_message == body.get("error_message")
+        assert (stored.completed_at is not None) == (
+            stored.status == TaskStatus.COMPLETED
+        )
 
-    def test_update_status_to_failed_without_error_message(self, test_dal):
+    def test_update_status_to_failed_without_error_message(
+        self, test_client, test_dal, run_async
+    ):
         """Test updating task status to failed without error message should fail."""
         # Create a task
-        task = asyncio.run(test_dal.create_bili_video_task("BV123456", "fav123", {}))
-
-        mock_get_session = MagicMock(return_value=self._create_mock_session(task))
+        task = run_async(test_dal.create_bili_video_task("BV123456", "fav123", {}))
 
-        with patch.object(test_dal, "get_session", mock_get_session):
-            with patch("blsync.api.get_task_dal", return_value=test_dal):
-                client = TestClient(app)
-                response = client.put(
-                    f"/api/tasks/{task.id}/status", json={"status": "failed"}
-                )
+        response = test_client.put(
+            f"/api/tasks/{task.id}/status", json={"status": "failed"}
+        )
 
         assert response.status_code == 400
         assert "error_message is required" in response.json()["detail"]
 
-    def test_update_status_invalid_status(self, test_dal):
+    def test_update_status_invalid_status(self, test_client, test_dal, run_async):
         """Test updating task status with invalid status value."""
         # Create a task
-        task = asyncio.run(test_dal.create_bili_video_task("BV123456", "fav123", {}))
+        task = run_async(test_dal.create_bili_video_task("BV123456", "fav123", {}))
 
-        mock_get_session = MagicMock(return_value=self._create_mock_session(task))
-
-        with patch.object(test_dal, "get_session", mock_get_session):
-            with patch("blsync.api.get_task_dal", return_value=test_dal):
-                client = TestClient(app)
-                response = client.put(
-                    f"/api/tasks/{task.id}/status", json={"status": "invalid_status"}
-                )
+        response = test_client.put(
+            f"/api/tasks/{task.id}/status", json={"status": "invalid_status"}
+        )
 
         assert response.status_code == 400
         assert "invalid status" in response.json()["detail"].lower()
 
-    def test_update_status_task_not_found(self, test_dal):
+    def test_update_status_task_not_found(self, test_client):
         """Test updating status for non-existent task."""
-        mock_get_session = MagicMock(return_value=self._create_mock_session(task=None))
-
-        with patch.object(test_dal, "get_session", mock_get_session):
-            with patch("blsync.api.get_task_dal", return_value=test_dal):
-                client = TestClient(app)
-                response = client.put(
-                    "/api/tasks/99999/status", json={"status": "done"}
-                )
+        response = test_client.put(
+            "/api/tasks/99999/status", json={"status": "completed"}
+        )
 
         assert response.status_code == 404
         assert "not found" in response.json()["detail"].lower()
 
-    def test_update_status_invalid_task_id(self):
+    def test_update_status_invalid_task_id(self, test_client):
         """Test updating status with invalid task ID format."""
-        client = TestClient(app)
-        response = client.put("/api/tasks/invalid/status", json={"status": "done"})
+        response = test_client.put(
+            "/api/tasks/invalid/status", json={"status": "completed"}
+        )
 
         assert response.status_code == 422  # Validation error
 
-    def test_update_status_missing_status_field(self, test_dal):
+    def test_update_status_missing_status_field(self, test_client, test_dal, run_async):
         """Test updating status without providing status field."""
         # Create a task
-        task = asyncio.run(test_dal.create_bili_video_task("BV123456", "fav123", {}))
+        task = run_async(test_dal.create_bili_video_task("BV123456", "fav123", {}))
 
-        mock_get_session = MagicMock(return_value=self._create_mock_session(task))
-
-        with patch.object(test_dal, "get_session", mock_get_session):
-            with patch("blsync.api.get_task_dal", return_value=test_dal):
-                client = TestClient(app)
-                response = client.put(
-                    f"/api/tasks/{task.id}/status",
-                    json={},  # Missing status field
-                )
+        response = test_client.put(
+            f"/api/tasks/{task.id}/status",
+            json={},  # Missing status field
+        )
 
         assert response.status_code == 422  # Validation error
@@ -0,0 +1,65 @@
+"""Test the favorites scan that enqueues download tasks."""
+
+import pytest
+
+from blsync.main import scan_favorites_once
+from blsync.model.task import BiliVideoTaskDAL, TaskStatus, make_bili_video_key
+
+
+class FakeBatchedScraper:
+    """Stand-in for BScraper that yields preset batches of (bvid, task_name)."""
+
+    def __init__(self, batches: list[list[tuple[str, str]]]):
+        self.batches = batches
+
+    async def get_all_bvids_batched(self, batch_size: int = 100):
+        for batch in self.batches:
+            yield batch
+
+
+@pytest.fixture
+async def scan_dal(monkeypatch):
+    """Point the scan at a fresh in-memory database."""
+    dal = BiliVideoTaskDAL("sqlite+aiosqlite:///:memory:", fast_unsafe=True)
+    await dal.create_tables()
+    monkeypatch.setattr("blsync.main.get_task_dal", lambda: dal)
+    yield dal
+    await dal.close()
+
+
+async def test_scan_favorites_once_counts_duplicates_once(scan_dal, monkeypatch):
+    """Test videos repeated within and across batches are handled once."""
+    await scan_dal.bulk_create_bili_video_tasks(
+        [("BV2", "fav1", {}), ("BV3", "fav1", {})]
+    )
+    await scan_dal.update_task_status(
+        make_bili_video_key("BV2", "fav1"), TaskStatus.FAILED, "Test error"
+    )
+    await scan_dal.update_task_status(
+        make_bili_video_key("BV3", "fav1"), TaskStatus.COMPLETED
+    )
+
+    scraper = FakeBatchedScraper(
+        [
+            [
+                ("BV1", "fav1"),
+                ("BV1", "fav1"),
+                ("BV2", "fav1"),
+                ("BV2", "fav1"),
+                ("BV3", "fav1"),
+            ],
+            [("BV1", "fav1"), ("BV2", "fav1")],
+        ]
+    )
+    monkeypatch.setattr("blsync.main.get_scraper", lambda: scraper)
+
+    stats = await scan_favorites_once()
+
+    assert stats == {"created": 1, "reset": 1, "skipped": 5}
+    assert await scan_dal.get_bili_video_task_status("BV1", "fav1") == (
+        TaskStatus.READY
+    )
+    assert await scan_dal.get_bili_video_task_status("BV2", "fav1") == (
+        TaskStatus.READY
+    )
+    assert (await scan_dal.get_task_stats())[TaskStatus.READY.value] == 2
@@ -1,7 +1,3 @@
-from unittest.mock import patch
-
-import pytest
-
 from blsync.consumer.bilibili import BiliVideoTaskContext
 from blsync.consumer.yutto_wrapper import (
     YuttoDownloadOptions,
@@ -12,7 +8,6 @@ from blsync.consumer.yutto_wrapper import (
 from blsync.progress import DownloadProgressEvent, ProgressEventType, TaskProgressBroker
 
 
-@pytest.mark.asyncio
 async def test_progress_broker_replays_latest_event():
     broker = TaskProgressBroker()
     event = DownloadProgressEvent(
@@ -29,8 +24,9 @@ async def test_progress_broker_replays_latest_event():
     await subscription.aclose()
 
 
-@pytest.mark.asyncio
-async def test_iter_download_video_progress_emits_completed_event(tmp_path):
+async def test_iter_download_video_progress_emits_completed_event(
+    tmp_path, monkeypatch
+):
     async def fake_run(_args, _verbose, callback, bvid):
         callback(
             DownloadProgressEvent(
@@ -48,17 +44,16 @@ async def test_iter_download_video_progress_emits_completed_event(tmp_path):
             )
         )
 
-    with patch(
-        "blsync.consumer.yutto_wrapper._run_yutto_download_in_thread",
-        side_effect=fake_run,
-    ):
-        events = [
-            event
-            async for event in iter_download_video_progress(
-                bvid="BV1",
-                download_path=tmp_path,
-            )
-        ]
+    monkeypatch.setattr(
+        "blsync.consumer.yutto_wrapper._run_yutto_download_in_thread", fake_run
+    )
+    events = [
+        event
+        async for event in iter_download_video_progress(
+            bvid="BV1",
+            download_path=tmp_path,
+        )
+    ]
 
     assert [event.event for event in events] == [
         ProgressEventType.STATUS,
@@ -68,8 +63,7 @@ async def test_iter_download_video_progress_emits_completed_event(tmp_path):
     assert events[-1].overall_percent == 100.0
 
 
-@pytest.mark.asyncio
-async def test_iter_download_video_progress_emits_retrying_event(tmp_path):
+async def test_iter_download_video_progress_emits_retrying_event(tmp_path, monkeypatch):
     from blsync.consumer.yutto_wrapper import YuttoRecoverableDownloadError
 
     calls = 0
@@ -80,17 +74,16 @@ async def test_iter_download_video_progress_emits_retrying_event(tmp_path):
         if calls == 1:
             raise YuttoRecoverableDownloadError([])
 
-    with patch(
-        "blsync.consumer.yutto_wrapper._run_yutto_download_in_thread",
-        side_effect=fake_run,
-    ):
-        events = [
-            event
-            async for event in iter_download_video_progress(
-                bvid="BV1",
-                download_path=tmp_path,
-            )
-        ]
+    monkeypatch.setattr(
+        "blsync.consumer.yutto_wrapper._run_yutto_download_in_thread", fake_run
+    )
+    events = [
+        event
+        async for event in iter_download_video_progress(
+            bvid="BV1",
+            download_path=tmp_path,
+        )
+    ]
 
     assert [event.event for event in events] == [
         ProgressEventType.STATUS,
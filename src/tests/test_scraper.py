@@ -1,29 +1,59 @@
 import pytest
 
-from blsync.configs import Config, load_configs
+from blsync.configs import Config, ConfigCredential
 from blsync.scraper import BScraper
 
 
 @pytest.fixture
-def my_config():
-    return load_configs([])
+def offline_scraper() -> BScraper:
+    """Create a BScraper from a config that needs no configuration file."""
+    return BScraper(
+        Config.model_construct(credential=ConfigCredential(), favorite_list={})
+    )
 
 
-@pytest.mark.asyncio
-async def test_get_bvids_from_favid(my_config: Config):
+@pytest.mark.network
+async def test_get_bvids_from_favid(scraper: BScraper):
     fid = 3079437303
-    bs = BScraper(my_config)
-
-    result = [x async for x in bs._get_bvids_from_favid(str(fid))]
+    result = [x async for x in scraper._get_bvids_from_favid(str(fid))]
     print(list(result))
     assert len(result) > 0
 
 
-@pytest.mark.asyncio
-async def test_get_all_bvids(my_config: Config):
-    bs = BScraper(my_config)
-
-    async for bvid, favid in bs.get_all_bvids():
-        print(f"{favid}: {bvid}")
+@pytest.mark.network
+async def test_get_all_bvids(scraper: BScraper):
+    async for bvid, favid in scraper.get_all_bvids():
         assert isinstance(bvid, str)
         assert isinstance(favid, str)
+
+
+@pytest.mark.network
+async def test_get_all_bvids_batched(scraper: BScraper):
+    async for batch in scraper.get_all_bvids_batched(batch_size=10):
+        assert 0 < len(batch) <= 10
+        for bvid, favid in batch:
+            assert isinstance(bvid, str)
+            assert isinstance(favid, str)
+
+
+@pytest.mark.parametrize(
+    "count,expected",
+    [(250, [100, 100, 50]), (200, [100, 100]), (0, [])],
+)
+async def test_get_all_bvids_batched_offline(
+    offline_scraper: BScraper, monkeypatch, count, expected
+):
+    async def fake_get_all_bvids():
+        for i in range(count):
+            yield f"BV{i}", "fav1"
+
+    monkeypatch.setattr(offline_scraper, "get_all_bvids", fake_get_all_bvids)
+
+    batches = [
+        batch async for batch in offline_scraper.get_all_bvids_batched(batch_size=100)
+    ]
+
+    assert [len(batch) for batch in batches] == expected
+    assert [item for batch in batches for item in batch] == [
+        (f"BV{i}", "fav1") for i in range(count)
+    ]
@@ -1,11 +1,11 @@
 """Test Task database models and SQLite creation."""
 
 import asyncio
-import tempfile
-from pathlib import Path
+import json
 
 import pytest
-from sqlalchemy import text
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import SQLAlchemyError
 
 from blsync.model.task import (
     BiliVideoTaskDAL,
@@ -14,129 +14,134 @@ from blsync.model.task import (
     TaskType,
     make_bili_video_key,
     parse_bili_video_key,
+    task_key_hash,
 )
 
 
-@pytest.mark.asyncio
+@pytest.fixture(scope="module")
+async def module_dal(make_rolled_back_dal):
+    """Create the in-memory test database once per module."""
+    dal = make_rolled_back_dal()
+    await dal.create_tables()
+    yield dal
+    await dal.close()
+
+
+@pytest.fixture
+async def dal(module_dal, rolled_back):
+    """Run each test inside a transaction that is rolled back afterwards."""
+    async with rolled_back(module_dal):
+        yield module_dal
+
+
 async def test_create_tables_in_memory():
     """Test creating tables in in-memory database."""
     dal = BiliVideoTaskDAL("sqlite+aiosqlite:///:memory:")
     await dal.create_tables()
 
-    # Verify tables exist by querying
-    async with dal.engine.begin() as conn:
-        result = await conn.execute(
-            text("SELECT name FROM sqlite_master WHERE type='table' AND name='tasks'")
+    # Verify tables exist without opening a write transaction
+    async with dal.engine.connect() as conn:
+        table_exists = await conn.run_sync(
+            lambda sync_conn: inspect(sync_conn).has_table("tasks")
         )
-        table_exists = result.first() is not None
-        assert table_exists, "Tasks table should exist"
+    assert table_exists, "Tasks table should exist"
 
     await dal.close()
 
 
-@pytest.mark.asyncio
-async def test_create_tables_file():
+async def test_create_tables_file(tmp_path):
     """Test creating tables in a file database."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db_url = f"sqlite+aiosqlite:///{db_path}"
-
-        # Ensure database file doesn't exist
-        assert not db_path.exists(), "Database file should not exist initially"
-
-        dal = BiliVideoTaskDAL(db_url)
-        await dal.create_tables()
-
-        # Verify database file was created
-        assert db_path.exists(), "Database file should be created"
-        assert db_path.stat().st_size > 0, "Database file should not be empty"
-
-        # Verify tables exist
-        async with dal.engine.begin() as conn:
-            result = await conn.execute(
-                text(
-                    "SELECT name FROM sqlite_master WHERE type='table' AND name='tasks'"
-                )
-            )
-            table_exists = result.first() is not None
-            assert table_exists, "Tasks table should exist"
+    db_path = tmp_path / "test.db"
+    dal = BiliVideoTaskDAL(f"sqlite+aiosqlite:///{db_path}")
 
-        await dal.close()
+    # Ensure database file doesn't exist
+    assert not db_path.exists(), "Database file should not exist initially"
 
+    await dal.create_tables()
 
-@pytest.mark.asyncio
-async def test_wal_mode_enabled():
-    """Test that WAL mode is enabled on database connections."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db_url = f"sqlite+aiosqlite:///{db_path}"
-        dal = BiliVideoTaskDAL(db_url)
-
-        # Create tables which should enable WAL mode
-        await dal.create_tables()
-
-        # Check WAL mode on a fresh connection from the pool
-        async with dal.engine.connect() as conn:
-            result = await conn.execute(text("PRAGMA journal_mode"))
-            journal_mode = result.scalar()
-            # WAL might not persist across connections in all SQLite versions,
-            # but check if it's set correctly on at least one connection
-            assert journal_mode in ("wal", "memory"), (
-                f"journal_mode should be wal or memory, got {journal_mode}"
-            )
+    # Verify database file was created
+    assert db_path.stat().st_size > 0, "Database file should not be empty"
 
-        await dal.close()
+    await dal.close()
 
 
-@pytest.mark.asyncio
-async def test_crud_operations():
-    """Test basic CRUD operations on tasks."""
-    dal = BiliVideoTaskDAL("sqlite+aiosqlite:///:memory:")
-    await dal.create_tables()
+async def test_wal_mode_enabled():
+    """Test that the journal mode pragma is applied on database connections."""
+    dal = BiliVideoTaskDAL(
+        "sqlite+aiosqlite:///file:test_wal_mode?mode=memory&cache=shared&uri=true"
+    )
+
+    # Probe on the connection that created the tables
+    journal_mode = await dal.create_tables()
+    # In-memory databases cannot use WAL and report "memory"
+    assert journal_mode in ("wal", "memory"), (
+        f"journal_mode should be wal or memory, got {journal_mode}"
+    )
+    assert await dal.get_journal_mode() == journal_mode
 
-    # Create a task
-    task_context = {"title": "Test Video", "url": "https://bilibili.com/video/test"}
-    task = await dal.create_bili_video_task("BV123456", "fav123", task_context)
+    await dal.close()
 
-    assert task.id is not None, "Task should have an ID"
-    assert task.task_type == TaskType.BILI_VIDEO.value
-    assert task.status == TaskStatus.READY.value
 
-    # Get task by key
+async def test_crud_operations(dal):
+    """Test basic CRUD operations on tasks."""
+    task_context = {"title": "Test Video", "url": "https://bilibili.com/video/test"}
     task_key = make_bili_video_key("BV123456", "fav123")
-    retrieved_task = await dal.get_task_by_key(task_key)
-    assert retrieved_task is not None, "Task should be retrieved"
-    assert retrieved_task.id == task.id
 
-    # Check if task exists
-    exists = await dal.has_bili_video_task("BV123456", "fav123")
-    assert exists, "Task should exist"
+    # Run the steps in one shared transaction
+    async with dal.session() as session:
+        # Create a task
+        task = await dal.create_bili_video_task(
+            "BV123456", "fav123", task_context, session=session
+        )
 
-    # Update task status
-    updated_task = await dal.update_task_status(task_key, TaskStatus.DONE)
-    assert updated_task is not None, "Task should be updated"
-    assert updated_task.status == TaskStatus.DONE.value
-    assert updated_task.completed_at is not None, "Task should have completion time"
+        assert task.id is not None, "Task should have an ID"
+        assert task.task_type == TaskType.BILI_VIDEO.value
+        assert task.status == TaskStatus.READY.value
 
-    # Get tasks by status
-    ready_tasks = await dal.get_tasks_by_status(TaskStatus.READY)
-    assert len(ready_tasks) == 0, "No ready tasks should exist"
+        # Get task by key
+        retrieved_task = await dal.get_task_by_key(task_key, session=session)
+        assert retrieved_task is not None, "Task should be retrieved"
+        assert retrieved_task.id == task.id
 
-    done_tasks = await dal.get_tasks_by_status(TaskStatus.DONE)
-    assert len(done_tasks) == 1, "One done task should exist"
+        # Check if task exists
+        exists = await dal.has_bili_video_task("BV123456", "fav123", session=session)
+        assert exists, "Task should exist"
 
-    # Delete task
-    deleted = await dal.delete_task(task_key)
-    assert deleted, "Task should be deleted"
+        # Update task status
+        updated_task = await dal.update_task_status(
+            task_key, TaskStatus.COMPLETED, session=session
+        )
+        assert updated_task is not None, "Task should be updated"
+        assert updated_task.status == TaskStatus.COMPLETED.value
+        assert updated_task.completed_at is not None, "Task should have completion time"
 
-    # Verify deletion
-    exists_after = await dal.has_bili_video_task("BV123456", "fav123")
-    assert not exists_after, "Task should not exist after deletion"
+        # Get tasks by status
+        ready_tasks = await dal.get_tasks_by_status(TaskStatus.READY, session=session)
+        assert len(ready_tasks) == 0, "No ready tasks should exist"
 
-    await dal.close()
+        completed_tasks = await dal.get_tasks_by_status(
+            TaskStatus.COMPLETED, with_data=True, session=session
+        )
+        assert len(completed_tasks) == 1, "One completed task should exist"
+        assert completed_tasks[0].task_context_dict == task_context
+
+    # Columns left unloaded by a fresh session raise instead of lazy loading
+    completed_tasks = await dal.get_tasks_by_status(TaskStatus.COMPLETED)
+    with pytest.raises(SQLAlchemyError):
+        completed_tasks[0].task_data
+
+    async with dal.session() as session:
+        # Delete task
+        deleted = await dal.delete_task(task_key, session=session)
+        assert deleted, "Task should be deleted"
+
+        # Verify deletion
+        exists_after = await dal.has_bili_video_task(
+            "BV123456", "fav123", session=session
+        )
+        assert not exists_after, "Task should not exist after deletion"
 
 
-@pytest.mark.asyncio
 async def test_task_key_helpers():
     """Test task key helper functions."""
     bvid = "BV123456"
@@ -153,34 +158,62 @@ async def test_task_key_helpers():
     assert parsed_bvid == bvid
     assert parsed_favid == favid
 
-
-@pytest.mark.asyncio
-async def test_task_model_from_context():
+    # Keys match the JSON encoder output, whether or not values need escaping
+    for bvid, favid in [("BV1xx411c7mD", "123"), ("BV1", "收藏夹"), ('a"b', "c\\d")]:
+        key = make_bili_video_key(bvid, favid)
+        assert key == json.dumps({"bvid": bvid, "favid": favid}, sort_keys=True)
+        assert parse_bili_video_key(key) == (bvid, favid)
+
+    # Repeated calls are served from the helpers' caches
+    hits = make_bili_video_key.cache_info().hits
+    assert make_bili_video_key(bvid, favid) is key
+    assert make_bili_video_key.cache_info().hits == hits + 1
+
+
+@pytest.mark.parametrize(
+    "bvid,favid,task_context",
+    [
+        (
+            "BV123456",
+            "fav123",
+            {"title": "Test Video", "url": "https://bilibili.com/video/test"},
+        ),
+        ("BV1xx411c7mD", "3079437303", {}),
+        ("BV1", "收藏夹", {"title": "中文标题"}),
+        ('a"b', "c\\d", {"title": 'quoted "title"'}),
+        ("BV2", "fav with spaces", {"selected_episodes": [0, 1, 2]}),
+        ("BV3", "-1", {"owner": {"name": "up", "mid": 1}, "pages": []}),
+        ("BV4", "fav1", {"title": None, "videos": 1, "ratio": 0.5}),
+        ("BV5", "fav1", {"emoji": "🎬", "newline": "a\nb"}),
+    ],
+)
+def test_task_model_from_context(bvid, favid, task_context):
     """Test creating TaskModel from task context."""
-    task_type = TaskType.BILI_VIDEO
-    task_key = {"bvid": "BV123456", "favid": "fav123"}
-    task_context = {"title": "Test Video", "url": "https://bilibili.com/video/test"}
+    task_key = {"bvid": bvid, "favid": favid}
 
-    task = TaskModel.from_task_context(task_type, task_key, task_context)
+    task = TaskModel.from_task_context(TaskType.BILI_VIDEO, task_key, task_context)
 
     assert task.task_type == TaskType.BILI_VIDEO.value
     assert task.status == TaskStatus.READY.value
+    assert task.task_key == make_bili_video_key(bvid, favid)
+    assert (task.bvid, task.favid) == (bvid, favid)
     assert task.key_dict == task_key
     assert task.task_context_dict == task_context
 
+    # Parsed values are reused until the underlying JSON changes
+    assert task.key_dict is task.key_dict
+    assert task.task_context_dict is task.task_context_dict
+    task.task_data = '{"title": "Other Video"}'
+    assert task.task_context_dict == {"title": "Other Video"}
 
-@pytest.mark.asyncio
-async def test_task_stats():
-    """Test getting task statistics."""
-    dal = BiliVideoTaskDAL("sqlite+aiosqlite:///:memory:")
-    await dal.create_tables()
 
+async def test_task_stats(dal):
+    """Test getting task statistics."""
     # Create multiple tasks with different statuses
-    await dal.create_bili_video_task("BV1", "fav1", {})
-    await dal.create_bili_video_task("BV2", "fav2", {})
+    await dal.bulk_create_bili_video_tasks([("BV1", "fav1", {}), ("BV2", "fav2", {})])
 
     task_key = make_bili_video_key("BV1", "fav1")
-    await dal.update_task_status(task_key, TaskStatus.DONE)
+    await dal.update_task_status(task_key, TaskStatus.COMPLETED)
 
     task_key2 = make_bili_video_key("BV2", "fav2")
     await dal.update_task_status(task_key2, TaskStatus.FAILED, "Test error")
@@ -191,21 +224,14 @@ async def test_task_stats():
     assert stats[TaskStatus.READY.value] == 0
     assert stats[TaskStatus.CONSUMING.value] == 0
     assert stats[TaskStatus.DOWNLOADING.value] == 0
-    assert stats[TaskStatus.DONE.value] == 1
+    assert stats[TaskStatus.COMPLETED.value] == 1
     assert stats[TaskStatus.FAILED.value] == 1
 
-    await dal.close()
-
 
-@pytest.mark.asyncio
-async def test_get_ready_tasks_with_limit():
+async def test_get_ready_tasks_with_limit(dal):
     """Test getting ready tasks with limit."""
-    dal = BiliVideoTaskDAL("sqlite+aiosqlite:///:memory:")
-    await dal.create_tables()
-
     # Create multiple tasks
-    for i in range(5):
-        await dal.create_bili_video_task(f"BV{i}", "fav1", {})
+    await dal.bulk_create_bili_video_tasks([(f"BV{i}", "fav1", {}) for i in range(5)])
 
     # Get with limit
     tasks = await dal.get_ready_tasks(limit=3)
@@ -215,22 +241,19 @@ async def test_get_ready_tasks_with_limit():
     all_tasks = await dal.get_ready_tasks()
     assert len(all_tasks) == 5, "Should return all tasks"
 
-    await dal.close()
-
 
-@pytest.mark.asyncio
-async def test_cleanup_stale_tasks():
+async def test_cleanup_stale_tasks(dal, monkeypatch):
     """Test cleanup of already downloaded tasks."""
-    dal = BiliVideoTaskDAL("sqlite+aiosqlite:///:memory:")
-    await dal.create_tables()
-
     # Create tasks
-    await dal.create_bili_video_task("BV1", "fav1", {})
-    await dal.create_bili_video_task("BV2", "fav1", {})
-    await dal.create_bili_video_task("BV3", "fav2", {})
+    await dal.bulk_create_bili_video_tasks(
+        [("BV1", "fav1", {}), ("BV2", "fav1", {}), ("BV3", "fav2", {})]
+    )
+    assert await dal.get_bili_video_task_status("BV1", "fav1") == TaskStatus.READY
 
     # Mark BV1 and BV2 as downloaded
-    downloaded_bvids = {"BV1", "BV2"}
+    downloaded_bvids = {"BV1", "BV2", "BV4"}
+    # Delete in several batches
+    monkeypatch.setattr(dal, "IN_CLAUSE_BATCH_SIZE", 2)
 
     # Cleanup tasks for fav1
     deleted_keys = await dal.delete_stale_tasks(downloaded_bvids, "fav1")
@@ -240,22 +263,22 @@ async def test_cleanup_stale_tasks():
     assert ("BV2", "fav1") in deleted_keys
 
     # Verify deletion
-    assert not await dal.has_bili_video_task("BV1", "fav1")
-    assert not await dal.has_bili_video_task("BV2", "fav1")
-    assert await dal.has_bili_video_task("BV3", "fav2"), "BV3 should still exist"
-
-    await dal.close()
+    assert await dal.get_bili_video_task_status("BV1", "fav1") is None
+    remaining = await dal.existing_bili_video_keys(
+        [("BV1", "fav1"), ("BV2", "fav1"), ("BV3", "fav2")]
+    )
+    assert remaining == {("BV3", "fav2")}, "Only BV3 should still exist"
 
 
-@pytest.mark.asyncio
 async def test_concurrent_operations():
     """Test concurrent database operations don't cause issues."""
-    dal = BiliVideoTaskDAL("sqlite+aiosqlite:///:memory:")
+    dal = BiliVideoTaskDAL("sqlite+aiosqlite:///:memory:", fast_unsafe=True)
     await dal.create_tables()
 
     async def create_tasks(start: int, count: int):
-        for i in range(start, start + count):
-            await dal.create_bili_video_task(f"BV{i}", f"fav{i}", {})
+        await dal.bulk_create_bili_video_tasks(
+            [(f"BV{i}", f"fav{i}", {}) for i in range(start, start + count)]
+        )
 
     # Run concurrent operations with non-overlapping keys
     tasks = [
@@ -271,3 +294,300 @@ async def test_concurrent_operations():
     assert len(all_tasks) == 30, "Should have 30 tasks total"
 
     await dal.close()
+
+
+async def test_task_status_cache(dal):
+    """Test status lookups are cached and invalidated on writes."""
+    assert await dal.get_bili_video_task_status("BV1", "fav1") is None
+
+    await dal.create_bili_video_task("BV1", "fav1", {})
+    assert await dal.get_bili_video_task_status("BV1", "fav1") == TaskStatus.READY
+
+    task_key = make_bili_video_key("BV1", "fav1")
+    assert dal._status_cache[task_key] == TaskStatus.READY
+
+    await dal.update_task_status(task_key, TaskStatus.FAILED, "Test error")
+    assert task_key not in dal._status_cache
+    assert await dal.get_bili_video_task_status("BV1", "fav1") == TaskStatus.FAILED
+
+    await dal.update_bili_video_task("BV1", "fav1", {}, reset_status=True)
+    assert await dal.get_bili_video_task_status("BV1", "fav1") == TaskStatus.READY
+
+    await dal.delete_task(task_key)
+    assert await dal.get_bili_video_task_status("BV1", "fav1") is None
+    assert not await dal.has_bili_video_task("BV1", "fav1")
+
+
+async def test_task_status_cache_is_bounded(dal, monkeypatch):
+    """Test the status cache evicts least recently used entries."""
+    monkeypatch.setattr(dal, "STATUS_CACHE_SIZE", 2)
+
+    for i in range(3):
+        await dal.create_bili_video_task(f"BV{i}", "fav1", {})
+        await dal.get_bili_video_task_status(f"BV{i}", "fav1")
+
+    assert list(dal._status_cache) == [
+        make_bili_video_key("BV1", "fav1"),
+        make_bili_video_key("BV2", "fav1"),
+    ]
+
+
+async def test_streamed_completed_bvids(dal, monkeypatch):
+    """Test completed bvids are streamed in batches."""
+    monkeypatch.setattr(dal, "STREAM_YIELD_PER", 2)
+
+    await dal.bulk_create_bili_video_tasks(
+        [(f"BV{i}", "fav1", {}) for i in range(5)] + [("BV0", "fav2", {})]
+    )
+    for i in range(3):
+        await dal.update_task_status(
+            make_bili_video_key(f"BV{i}", "fav1"), TaskStatus.COMPLETED
+        )
+
+    assert await dal.get_completed_bvids("fav1") == {"BV0", "BV1", "BV2"}
+    assert await dal.get_completed_bvids("fav2") == set()
+
+
+async def test_update_task_with_large_context(dal):
+    """Test updating a task with a context serialized off the event loop."""
+    await dal.create_bili_video_task("BV1", "fav1", {})
+
+    task_context = {"selected_episodes": list(range(10000))}
+    task = await dal.update_bili_video_task("BV1", "fav1", task_context)
+
+    assert task is not None
+    assert task.task_context_dict == task_context
+
+
+async def test_create_tables_upgrades_old_schema():
+    """Test columns added after a database was created are backfilled."""
+    dal = BiliVideoTaskDAL("sqlite+aiosqlite:///:memory:")
+
+    # Tasks table as created by earlier versions
+    async with dal.engine.begin() as conn:
+        await conn.execute(
+            text(
+                "CREATE TABLE tasks ("
+                "id INTEGER PRIMARY KEY, task_type VARCHAR(50), "
+                "task_key VARCHAR(500), task_data TEXT, status VARCHAR(20), "
+                "created_at DATETIME, updated_at DATETIME, "
+                "completed_at DATETIME, error_message TEXT)"
+            )
+        )
+        await conn.execute(text("CREATE INDEX ix_tasks_status ON tasks (status)"))
+        await conn.execute(
+            text(
+                "INSERT INTO tasks (task_type, task_key, task_data, status, "
+                "created_at, updated_at) VALUES ('bili_video', :task_key, '{}', "
+                "'completed', '2026-01-01 00:00:00', '2026-01-01 00:00:00')"
+            ),
+            {"task_key": make_bili_video_key("BV1", "fav1")},
+        )
+
+    await dal.create_tables()
+
+    task = await dal.get_task_by_key(make_bili_video_key("BV1", "fav1"))
+    assert task is not None
+    assert task.task_key_hash == task_key_hash(task.task_key)
+    assert (task.bvid, task.favid) == ("BV1", "fav1")
+    assert await dal.get_bili_video_task_status("BV1", "fav1") == TaskStatus.COMPLETED
+    assert await dal.get_completed_bvids("fav1") == {"BV1"}
+
+    # The single-column status index is superseded by (status, created_at)
+    async with dal.engine.connect() as conn:
+        index_names = await conn.run_sync(
+            lambda sync_conn: {
+                index["name"] for index in inspect(sync_conn).get_indexes("tasks")
+            }
+        )
+    assert "ix_tasks_status" not in index_names
+
+    await dal.close()
+
+
+async def test_delete_tasks(dal, monkeypatch):
+    """Test deleting several tasks across IN clause batches."""
+    monkeypatch.setattr(dal, "IN_CLAUSE_BATCH_SIZE", 4)
+    await dal.bulk_create_bili_video_tasks([(f"BV{i}", "fav1", {}) for i in range(3)])
+    for i in range(3):
+        await dal.get_bili_video_task_status(f"BV{i}", "fav1")
+
+    deleted = await dal.delete_tasks(
+        [
+            make_bili_video_key("BV0", "fav1"),
+            make_bili_video_key("BV1", "fav1"),
+            make_bili_video_key("BV9", "fav1"),
+        ]
+    )
+
+    assert deleted == 2
+    assert await dal.delete_tasks([]) == 0
+    assert not await dal.has_bili_video_task("BV0", "fav1")
+    assert not await dal.has_bili_video_task("BV1", "fav1")
+    assert await dal.has_bili_video_task("BV2", "fav1")
+
+
+async def test_sqlite_pragmas_on_file_database(tmp_path):
+    """Test file databases are tuned for WAL while memory ones are left alone."""
+    dal = BiliVideoTaskDAL(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+
+    async with dal.engine.connect() as conn:
+        assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+        # NORMAL
+        assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1
+        assert (await conn.execute(text("PRAGMA cache_size"))).scalar() == -65536
+        # MEMORY
+        assert (await conn.execute(text("PRAGMA temp_store"))).scalar() == 2
+
+    await dal.close()
+
+    dal = BiliVideoTaskDAL("sqlite+aiosqlite:///:memory:")
+    async with dal.engine.connect() as conn:
+        # FULL
+        assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 2
+    await dal.close()
+
+
+async def test_sqlite_pragmas_fast_unsafe(tmp_path):
+    """Test throwaway databases skip journaling and fsync."""
+    dal = BiliVideoTaskDAL(
+        f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", fast_unsafe=True
+    )
+
+    async with dal.engine.connect() as conn:
+        assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "memory"
+        # OFF
+        assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 0
+        # MEMORY
+        assert (await conn.execute(text("PRAGMA temp_store"))).scalar() == 2
+
+    await dal.close()
+
+
+async def test_get_task_statuses(dal, monkeypatch):
+    """Test looking up the statuses of several tasks at once."""
+    await dal.bulk_create_bili_video_tasks([(f"BV{i}", "fav1", {}) for i in range(5)])
+    await dal.update_task_status(make_bili_video_key("BV0", "fav1"), TaskStatus.FAILED)
+    # Cached statuses are merged with queried ones
+    await dal.get_bili_video_task_status("BV1", "fav1")
+
+    # Query in several batches
+    monkeypatch.setattr(dal, "IN_CLAUSE_BATCH_SIZE", 4)
+    task_keys = [make_bili_video_key(f"BV{i}", "fav1") for i in range(7)]
+    statuses = await dal.get_task_statuses(task_keys)
+
+    assert statuses == {
+        task_keys[0]: TaskStatus.FAILED,
+        **{task_key: TaskStatus.READY for task_key in task_keys[1:5]},
+    }
+    assert await dal.existing_task_keys(task_keys) == set(task_keys[:5])
+    assert await dal.get_task_statuses([]) == {}
+
+
+async def test_create_existing_task(dal):
+    """Test creating a task that already exists leaves the stored one alone."""
+    task = await dal.create_bili_video_task("BV1", "fav1", {"title": "First"})
+    assert task is not None
+    assert (task.bvid, task.favid) == ("BV1", "fav1")
+
+    assert await dal.create_bili_video_task("BV1", "fav1", {"title": "Second"}) is None
+
+    stored = await dal.get_task_by_key(make_bili_video_key("BV1", "fav1"))
+    assert stored.id == task.id
+    assert stored.task_context_dict == {"title": "First"}
+
+
+async def test_bulk_create_tasks(dal):
+    """Test creating several tasks with one statement."""
+    await dal.create_bili_video_task("BV1", "fav1", {})
+    assert await dal.get_bili_video_task_status("BV1", "fav1") == TaskStatus.READY
+
+    created = await dal.bulk_create_bili_video_tasks(
+        [(f"BV{i}", "fav1", {"index": i}) for i in range(3)]
+    )
+
+    # The existing task is skipped
+    assert {task.bvid: task.task_context_dict for task in created} == {
+        "BV0": {"index": 0},
+        "BV2": {"index": 2},
+    }
+    assert all(task.id is not None for task in created)
+    assert (await dal.get_task_stats())[TaskStatus.READY.value] == 3
+    assert await dal.bulk_create_bili_video_tasks([]) == []
+
+
+async def test_shared_session_defers_side_effects(dal, monkeypatch):
+    """Test events and cache invalidations wait for the shared commit."""
+    published = []
+    monkeypatch.setattr(
+        dal,
+        "_publish_status_event",
+        lambda task, status, error_message=None: published.append((task.bvid, status)),
+    )
+    await dal.bulk_create_bili_video_tasks([("BV1", "fav1", {})])
+    assert published == [("BV1", TaskStatus.READY)]
+    published.clear()
+
+    task_key = make_bili_video_key("BV1", "fav1")
+    assert await dal.get_bili_video_task_status("BV1", "fav1") == TaskStatus.READY
+
+    # Nothing is published or invalidated for a rolled back transaction
+    with pytest.raises(RuntimeError):
+        async with dal.session() as session:
+            await dal.update_task_status(
+                task_key, TaskStatus.FAILED, "Test error", session=session
+            )
+            await dal.create_bili_video_task("BV2", "fav1", {}, session=session)
+            raise RuntimeError
+
+    assert published == []
+    assert dal._status_cache[task_key] == TaskStatus.READY
+    assert not await dal.has_bili_video_task("BV2", "fav1")
+
+    async with dal.session() as session:
+        await dal.bulk_create_bili_video_tasks([("BV2", "fav1", {})], session=session)
+        await dal.update_task_status(task_key, TaskStatus.COMPLETED, session=session)
+        assert published == []
+
+    assert published == [("BV2", TaskStatus.READY), ("BV1", TaskStatus.COMPLETED)]
+    assert task_key not in dal._status_cache
+    assert await dal.get_bili_video_task_status("BV1", "fav1") == (TaskStatus.COMPLETED)
+
+
+async def test_plain_session_runs_side_effects_on_commit(dal, monkeypatch):
+    """Test sessions not opened by session() still publish and invalidate."""
+    published = []
+    monkeypatch.setattr(
+        dal,
+        "_publish_status_event",
+        lambda task, status, error_message=None: published.append((task.bvid, status)),
+    )
+    await dal.create_bili_video_task("BV1", "fav1", {})
+    task_key = make_bili_video_key("BV1", "fav1")
+    assert await dal.get_bili_video_task_status("BV1", "fav1") == TaskStatus.READY
+    published.clear()
+
+    async with dal.async_session() as session:
+        await dal.update_task_status(task_key, TaskStatus.FAILED, session=session)
+        await session.rollback()
+    assert published == []
+    assert dal._status_cache[task_key] == TaskStatus.READY
+
+    async with dal.async_session() as session:
+        await dal.update_task_status(task_key, TaskStatus.FAILED, session=session)
+        await session.commit()
+    assert published == [("BV1", TaskStatus.FAILED)]
+    assert await dal.get_bili_video_task_status("BV1", "fav1") == TaskStatus.FAILED
+
+
+async def test_shared_session_bypasses_status_cache(dal):
+    """Test lookups in a shared session see its own uncommitted writes."""
+    await dal.create_bili_video_task("BV1", "fav1", {})
+    task_key = make_bili_video_key("BV1", "fav1")
+    assert await dal.get_bili_video_task_status("BV1", "fav1") == TaskStatus.READY
+
+    async with dal.session() as session:
+        assert await dal.delete_task(task_key, session=session)
+        assert not await dal.has_bili_video_task("BV1", "fav1", session=session)
+
+    assert not await dal.has_bili_video_task("BV1", "fav1")